@@ -0,0 +1,68 @@
+"""
+Сравнивает задержки API при разных режимах соединений с PostgreSQL:
+новое соединение на каждый запрос, постоянные соединения
+(CONN_MAX_AGE) и пул psycopg 3 (DB_POOL). Каждый режим — отдельный
+запуск gunicorn с профилем config/gunicorn.py и своими переменными
+окружения; нагрузка и отчёт — как в load_test.py.
+
+Пример (из корня проекта, база и .env — как для runserver):
+
+    python benchmarks/db_connections.py --token "$ACCESS_TOKEN" \\
+        --concurrency 100 --duration 30
+
+Для сравнения с pgbouncer запустите сервис профиля pgbouncer и укажите
+--db-host и --db-port пула.
+"""
+
+import argparse
+import asyncio
+import json
+
+from serving import PROFILES, run_profile
+
+MODES = {
+    "per_request": {"DB_POOL": "False", "DB_CONN_MAX_AGE": "0"},
+    "persistent": {"DB_POOL": "False", "DB_CONN_MAX_AGE": "600"},
+    "pool": {"DB_POOL": "True", "DB_CONN_MAX_AGE": "0"},
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--mode",
+        action="append",
+        choices=list(MODES),
+        help="Режим; по умолчанию — все.",
+    )
+    parser.add_argument("--db-host", help="Переопределяет DB_HOST.")
+    parser.add_argument("--db-port", help="Переопределяет DB_PORT.")
+    parser.add_argument(
+        "--path", default="/network/api/network_objects/?page_size=20"
+    )
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--startup-timeout", type=float, default=30)
+    parser.add_argument("--token", help="JWT access-токен.")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    overrides = {}
+    if args.db_host:
+        overrides["DB_HOST"] = args.db_host
+    if args.db_port:
+        overrides["DB_PORT"] = args.db_port
+    for name in args.mode or MODES:
+        result = await run_profile(
+            name, PROFILES["tuned"], args, {**MODES[name], **overrides}
+        )
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Отчёт о времени загрузки воркера: запускает в отдельном процессе
+python -X importtime, выполняет django.setup(), загружает URL-конфигурацию
+и WSGI-приложение и выводит JSON с общим временем импорта, временем
+до готовности и самыми долгими пакетами верхнего уровня.
+
+Пример сравнения профилей настроек (из корня проекта):
+
+    python benchmarks/importtime.py --profile development \\
+        --profile production
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+BOOT = """
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+application = get_wsgi_application()
+get_resolver().url_patterns
+"""
+
+
+def parse_importtime(stderr):
+    """
+    Возвращает {пакет верхнего уровня: микросекунды} по собственному
+    времени импорта модулей.
+    """
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    return packages
+
+
+def measure(profile, settings_module, top):
+    env = {
+        **os.environ,
+        "SETTINGS_PROFILE": profile,
+        "DJANGO_SETTINGS_MODULE": settings_module,
+    }
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    boot_ms = (time.perf_counter() - started) * 1000
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    packages = parse_importtime(result.stderr)
+    return {
+        "profile": profile,
+        "boot_ms": round(boot_ms, 1),
+        "import_ms": round(sum(packages.values()) / 1000, 1),
+        "packages": len(packages),
+        "top_packages_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(
+                packages.items(), key=lambda item: item[1], reverse=True
+            )[:top]
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--profile",
+        action="append",
+        help="Значение SETTINGS_PROFILE; можно указать несколько раз.",
+    )
+    parser.add_argument("--settings", default="config.settings")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Запусков на профиль."
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Пакетов в отчёте."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    for profile in args.profile or ["development", "production"]:
+        runs = [
+            measure(profile, args.settings, args.top)
+            for _ in range(args.repeat)
+        ]
+        best = min(runs, key=lambda run: run["boot_ms"])
+        print(json.dumps(best, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
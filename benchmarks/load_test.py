@@ -0,0 +1,203 @@
+"""
+Нагрузочный тест чтения API: сравнивает задержки (p50, p99) и пропускную
+способность нескольких стеков при заданном числе одновременных клиентов.
+
+Каждый клиент держит своё keep-alive соединение и отправляет запросы
+последовательно. Зависимостей, кроме стандартной библиотеки, нет.
+
+Пример сравнения WSGI и ASGI на 500 клиентах:
+
+    python benchmarks/load_test.py --concurrency 500 --duration 30 \\
+        --token "$ACCESS_TOKEN" \\
+        --target wsgi=http://127.0.0.1:8000/network/api/network_objects/ \\
+        --target asgi=http://127.0.0.1:8001/network/api/async/network_objects/
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+class Client:
+    """Клиент HTTP/1.1 на одном keep-alive соединении."""
+
+    def __init__(self, url, headers, timeout):
+        parts = urlsplit(url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path = f"{self.path}?{parts.query}"
+        self.timeout = timeout
+        lines = [
+            f"GET {self.path} HTTP/1.1",
+            f"Host: {parts.netloc}",
+            "Connection: keep-alive",
+            "Accept: application/json",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        self.request = ("\r\n".join(lines) + "\r\n\r\n").encode()
+        self.reader = self.writer = None
+
+    async def connect(self):
+        context = ssl.create_default_context() if self.https else None
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, ssl=context
+        )
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.reader = self.writer = None
+
+    async def _read_body(self, headers):
+        if headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    return
+        length = int(headers.get("content-length", 0))
+        if length:
+            await self.reader.readexactly(length)
+
+    async def _get(self):
+        if self.writer is None:
+            await self.connect()
+        self.writer.write(self.request)
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Соединение закрыто сервером.")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        await self._read_body(headers)
+        if headers.get("connection") == "close":
+            await self.close()
+        return status
+
+    async def get(self):
+        """Выполняет запрос и возвращает код ответа."""
+        try:
+            return await asyncio.wait_for(self._get(), self.timeout)
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError,
+                asyncio.IncompleteReadError):
+            await self.close()
+            raise
+
+
+async def _worker(client, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            status = await client.get()
+        except Exception:
+            errors.append("connection")
+            continue
+        if status >= 400:
+            errors.append(status)
+            continue
+        latencies.append(time.perf_counter() - started)
+    await client.close()
+
+
+def _percentile(values, percent):
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[
+        percent - 1
+    ]
+
+
+async def run_target(name, url, args):
+    """Нагружает один стек и возвращает сводку результатов."""
+    headers = {}
+    if args.token:
+        headers["Authorization"] = f"Bearer {args.token}"
+    warmup = Client(url, headers, args.timeout)
+    for _ in range(args.warmup):
+        await warmup.get()
+    await warmup.close()
+    latencies = []
+    errors = []
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(
+        *(
+            _worker(
+                Client(url, headers, args.timeout),
+                deadline,
+                latencies,
+                errors,
+            )
+            for _ in range(args.concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    return {
+        "target": name,
+        "url": url,
+        "concurrency": args.concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": _milliseconds(_percentile(latencies, 50)),
+        "p99_ms": _milliseconds(_percentile(latencies, 99)),
+        "max_ms": _milliseconds(max(latencies, default=None)),
+    }
+
+
+def _milliseconds(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        metavar="NAME=URL",
+        help="Стек и URL для нагрузки; можно указать несколько раз.",
+    )
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument(
+        "--duration", type=float, default=30, help="Секунд на стек."
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=20, help="Прогревочных запросов."
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30, help="Тайм-аут запроса."
+    )
+    parser.add_argument("--token", help="JWT access-токен.")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    for target in args.target:
+        name, _, url = target.partition("=")
+        result = await run_target(name, url, args)
+        print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
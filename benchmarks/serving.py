@@ -0,0 +1,97 @@
+"""
+Сравнивает пропускную способность gunicorn с настройками по умолчанию
+(sync-воркер, без keep-alive) и с профилем config/gunicorn.py на одной
+машине: по очереди запускает оба сервера и нагружает их load_test.py.
+
+Пример (из корня проекта, база и .env — как для runserver):
+
+    python benchmarks/serving.py --token "$ACCESS_TOKEN" \\
+        --concurrency 200 --duration 30
+
+Чтобы сравнить nginx с keep-alive к upstream и без него, запустите
+load_test.py против порта nginx до и после изменения конфигурации.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import time
+
+from load_test import run_target
+
+PROFILES = {
+    "default": ["gunicorn", "config.wsgi:application"],
+    "tuned": [
+        "gunicorn",
+        "-c",
+        "config/gunicorn.py",
+        "config.wsgi:application",
+    ],
+}
+
+
+def wait_for_port(host, port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Сервер {host}:{port} не запустился.")
+
+
+async def run_profile(name, command, args, env=None):
+    """Запускает gunicorn, нагружает его и останавливает."""
+    server = subprocess.Popen(
+        [*command, "--bind", f"127.0.0.1:{args.port}",
+         "--log-level", "warning"],
+        env={**os.environ, "GUNICORN_ACCESS_LOG": "", **(env or {})},
+    )
+    try:
+        wait_for_port("127.0.0.1", args.port, args.startup_timeout)
+        url = f"http://127.0.0.1:{args.port}{args.path}"
+        return await run_target(name, url, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--profile",
+        action="append",
+        choices=list(PROFILES),
+        help="Профиль; по умолчанию — все.",
+    )
+    parser.add_argument(
+        "--path", default="/network/api/network_objects/?page_size=20"
+    )
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--startup-timeout", type=float, default=30)
+    parser.add_argument("--token", help="JWT access-токен.")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for name in args.profile or PROFILES:
+        result = await run_profile(name, PROFILES[name], args)
+        results.append(result)
+        print(json.dumps(result, ensure_ascii=False))
+    if len(results) == 2 and results[0]["throughput_rps"]:
+        ratio = results[1]["throughput_rps"] / results[0]["throughput_rps"]
+        print(json.dumps({"throughput_ratio": round(ratio, 2)}))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+import hashlib
+import threading
+from functools import cache
+
+from django.conf import settings
+from rest_framework import permissions
+from rest_framework.response import Response
+
+SCHEMA_APPS = ("config", "network", "users")
+
+_schemas = {}
+_schemas_lock = threading.Lock()
+
+
+@cache
+def _source_version():
+    digest = hashlib.sha1()
+    for app in SCHEMA_APPS:
+        for path in sorted((settings.BASE_DIR / app).rglob("*.py")):
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    return digest.hexdigest()
+
+
+def code_version():
+    """
+    Версия кода для ключа кеша схемы: CODE_VERSION из настроек или,
+    если она не задана, хеш путей и времени изменения модулей проекта.
+    """
+    return settings.CODE_VERSION or _source_version()
+
+
+def api_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title="API Documentation",
+        default_version="v1",
+        description="API для сети по продаже электроники",
+        terms_of_service="https://www.example.com/policies/terms/",
+        contact=openapi.Contact(email="contact@example.com"),
+        license=openapi.License(name="BSD License"),
+    )
+
+
+def clear_schema_cache():
+    with _schemas_lock:
+        _schemas.clear()
+
+
+@cache
+def _schema_ui_view(renderer):
+    from drf_yasg.views import SPEC_RENDERERS, get_schema_view
+
+    spec_formats = {spec_renderer.format for spec_renderer in SPEC_RENDERERS}
+    schema_view = get_schema_view(
+        api_info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+
+    class CachedSchemaView(schema_view):
+        """
+        Схема собирается один раз на процесс для версии кода, версии API
+        и адреса сервера; страница UI без схемы не кешируется.
+        """
+
+        def get(self, request, version="", format=None):
+            if request.accepted_renderer.format not in spec_formats:
+                return super().get(request, version, format)
+            key = (
+                code_version(),
+                request.version or version or "",
+                request.build_absolute_uri("/"),
+            )
+            with _schemas_lock:
+                schema = _schemas.get(key)
+                if schema is None:
+                    schema = super().get(request, version, format).data
+                    _schemas[key] = schema
+            return Response(schema)
+
+    return CachedSchemaView.with_ui(renderer, cache_timeout=0)
+
+
+def schema_ui(renderer):
+    """
+    Представление документации API (swagger или redoc). drf_yasg
+    импортируется и схема собирается при первом запросе, а не при
+    загрузке URL-конфигурации воркера.
+    """
+
+    def view(request, *args, **kwargs):
+        return _schema_ui_view(renderer)(request, *args, **kwargs)
+
+    return view
+
+
+def generate_schema(url=None):
+    """Собирает публичную схему API без запроса, для выгрузки в файл."""
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    generator = OpenAPISchemaGenerator(api_info(), url=url)
+    return generator.get_schema(request=None, public=True)
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def is_process_local_cache(alias="default"):
+    """Кеш не виден другим процессам (воркерам gunicorn)."""
+    return settings.CACHES[alias]["BACKEND"] in PROCESS_LOCAL_CACHES
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Отзыв токенов и закрепление пользователя за основной базой хранятся
+    в кеше и должны быть видны всем воркерам: при JWT_STATELESS_AUTH
+    и при репликах для чтения нужен общий кеш.
+    """
+    if not is_process_local_cache():
+        return []
+    errors = []
+    if settings.JWT_STATELESS_AUTH:
+        errors.append(
+            Error(
+                "JWT_STATELESS_AUTH требует общего кеша: отзыв токенов "
+                "в LocMemCache виден только одному процессу.",
+                hint="Укажите CACHE_BACKEND, например RedisCache.",
+                id="config.E001",
+            )
+        )
+    if settings.DATABASE_REPLICAS:
+        errors.append(
+            Error(
+                "Реплики для чтения требуют общего кеша: закрепление "
+                "за основной базой после записи в LocMemCache видно "
+                "только одному процессу.",
+                hint="Укажите CACHE_BACKEND, например RedisCache.",
+                id="config.E002",
+            )
+        )
+    return errors
@@ -0,0 +1,175 @@
+import contextvars
+import random
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_KEY = "db:pin:{}"
+
+_replica_reads = contextvars.ContextVar("replica_reads", default=False)
+_writes = contextvars.ContextVar("db_writes", default=None)
+
+
+class _Writes:
+    def __init__(self):
+        self.happened = False
+
+
+def replicas():
+    return settings.DATABASE_REPLICAS
+
+
+class ReplicaRouter:
+    """
+    Направляет чтения в реплики только внутри read_from_replica()
+    и вне транзакций основной базы. Запись, миграции и все остальные
+    чтения выполняются в основной базе.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or not replicas():
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas())
+
+    def db_for_write(self, model, **hints):
+        writes = _writes.get()
+        if writes is not None:
+            writes.happened = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replicas():
+            return False
+        return None
+
+
+@contextmanager
+def read_from_replica(enabled=True):
+    """Чтения внутри блока идут в реплики, если enabled."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reads_from_replica():
+    """Идут ли чтения в текущем контексте в реплики."""
+    return (
+        _replica_reads.get()
+        and bool(replicas())
+        and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+    )
+
+
+def in_current_context(iterator):
+    """
+    Возвращает итератор, каждый шаг которого выполняется в контексте
+    момента вызова: потоковый ответ, который читается после выхода из
+    представления, продолжает читать из той же базы.
+    """
+    context = contextvars.copy_context()
+
+    def steps():
+        while True:
+            try:
+                yield context.run(next, iterator)
+            except StopIteration:
+                return
+
+    return steps()
+
+
+def is_pinned(user):
+    """
+    Проверяет, писал ли пользователь в базу недавно: такие запросы
+    читают из основной базы, чтобы видеть свои изменения.
+    """
+    if not replicas() or not user.is_authenticated:
+        return False
+    return bool(cache.get(PIN_KEY.format(user.pk)))
+
+
+def pin_to_primary(user):
+    cache.set(
+        PIN_KEY.format(user.pk), True, settings.DATABASE_REPLICA_PIN_SECONDS
+    )
+
+
+class ReplicaReadMixin:
+    """
+    Представление DRF, безопасные запросы которого читают из реплик,
+    если пользователь недавно не писал в базу.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.replica_reads = ExitStack()
+        if request.method in SAFE_METHODS and not is_pinned(request.user):
+            self.replica_reads.enter_context(read_from_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        replica_reads = getattr(self, "replica_reads", None)
+        if replica_reads is not None:
+            replica_reads.close()
+        return response
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Если запрос что-то записал в базу, следующие запросы пользователя
+    в течение DATABASE_REPLICA_PIN_SECONDS читают из основной базы.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        writes = _Writes()
+        token = _writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            _writes.reset(token)
+        self._pin(request, writes)
+        return response
+
+    async def __acall__(self, request):
+        writes = _Writes()
+        token = _writes.set(writes)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _writes.reset(token)
+        self._pin(request, writes)
+        return response
+
+    @staticmethod
+    def _pin(request, writes):
+        user = getattr(request, "user", None)
+        if writes.happened and replicas() and user is not None:
+            if user.is_authenticated:
+                pin_to_primary(user)
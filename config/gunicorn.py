@@ -0,0 +1,39 @@
+"""
+Настройки gunicorn для промышленного запуска:
+
+    gunicorn -c config/gunicorn.py config.wsgi:application
+
+Значения по умолчанию рассчитаны по числу ядер и переопределяются
+переменными окружения GUNICORN_*.
+"""
+
+import multiprocessing
+import os
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+# gthread: потоки воркера ждут БД и клиента, не блокируя процесс, а
+# keep-alive соединения от nginx не занимают воркер целиком.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("GUNICORN_WORKERS", cpu_count * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+# Код приложения загружается один раз до fork: воркеры стартуют быстрее
+# и делят страницы памяти с мастером.
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+# Дольше, чем upstream keepalive_timeout в nginx: соединение закрывает
+# nginx, а не gunicorn посреди запроса.
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 75))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+# Перезапуск воркеров ограничивает рост памяти, разброс не даёт им
+# перезапуститься одновременно.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# Файл heartbeat в памяти, а не на overlay-диске контейнера.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+forwarded_allow_ips = os.getenv("GUNICORN_FORWARDED_ALLOW_IPS", "*")
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
@@ -0,0 +1,276 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+UNRESOLVED = "<unresolved>"
+
+_current = ContextVar("request_metrics", default=None)
+
+
+class Histogram:
+    """Гистограмма в формате Prometheus с метками view и method."""
+
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self.lock:
+            counts, total = self.series.get(
+                labels, ([0] * (len(self.buckets) + 1), 0)
+            )
+            counts[bisect_left(self.buckets, value)] += 1
+            self.series[labels] = (counts, total + value)
+
+    def collect(self):
+        with self.lock:
+            series = {
+                labels: (list(counts), total)
+                for labels, (counts, total) in self.series.items()
+            }
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for (view, method), (counts, total) in sorted(series.items()):
+            labels = f'view="{view}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                yield (
+                    f'{self.name}_bucket{{{labels},le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            yield f"{self.name}_sum{{{labels}}} {total}"
+            yield f"{self.name}_count{{{labels}}} {cumulative}"
+
+    def reset(self):
+        with self.lock:
+            self.series.clear()
+
+
+class Registry:
+    """Метрики запросов одного процесса."""
+
+    def __init__(self):
+        self.duration = Histogram(
+            "http_request_duration_seconds",
+            "Полное время обработки запроса.",
+            DURATION_BUCKETS,
+        )
+        self.db_queries = Histogram(
+            "http_request_db_queries",
+            "Число SQL-запросов на запрос.",
+            QUERY_BUCKETS,
+        )
+        self.db_duration = Histogram(
+            "http_request_db_duration_seconds",
+            "Время SQL-запросов на запрос.",
+            DURATION_BUCKETS,
+        )
+        self.serializer_duration = Histogram(
+            "http_request_serializer_duration_seconds",
+            "Время сериализации ответа.",
+            DURATION_BUCKETS,
+        )
+        self.histograms = (
+            self.duration,
+            self.db_queries,
+            self.db_duration,
+            self.serializer_duration,
+        )
+
+    def record(self, view, method, metrics):
+        labels = (view, method)
+        self.duration.observe(labels, metrics.total_time)
+        self.db_queries.observe(labels, metrics.queries)
+        self.db_duration.observe(labels, metrics.db_time)
+        self.serializer_duration.observe(labels, metrics.serializer_time)
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.collect())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        for histogram in self.histograms:
+            histogram.reset()
+
+
+registry = Registry()
+
+
+class RequestMetrics:
+    """Счётчики одного запроса."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.total_time = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        """Обёртка выполнения SQL: считает запросы и их время."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+    def server_timing(self):
+        return ", ".join(
+            (
+                f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} '
+                'queries"',
+                f"serializer;dur={self.serializer_time * 1000:.1f}",
+                f"total;dur={self.total_time * 1000:.1f}",
+            )
+        )
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Обёртка выполнения SQL всех соединений: считает запрос в метриках
+    текущего запроса. Метрики передаются через contextvar, поэтому
+    запросы ORM из потоков sync_to_async тоже учитываются.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_wrapper(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def connect_query_wrapper():
+    """
+    Ставит обёртку на каждое новое соединение и на уже открытые
+    соединения текущего потока. Вызывается при запуске приложения, пока
+    соединений других потоков ещё нет: они принадлежат своим потокам,
+    и позже обёртку на них не поставить.
+    """
+    connection_created.connect(
+        install_query_wrapper, dispatch_uid="metrics_query_wrapper"
+    )
+    for connection in connections.all(initialized_only=True):
+        install_query_wrapper(connection)
+
+
+class TimedSerializerMixin:
+    """
+    Учитывает время to_representation в метриках текущего запроса.
+    Вложенные сериализаторы входят во время внешнего.
+    """
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)
+        metrics.serializing = True
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_time += time.perf_counter() - started
+            metrics.serializing = False
+
+
+class MetricsMiddleware:
+    """
+    Считает для каждого запроса число и время SQL-запросов, время
+    сериализации и полное время, складывает их в гистограммы по имени
+    маршрута, при METRICS_SERVER_TIMING добавляет заголовок
+    Server-Timing и пишет в журнал запросы, превысившие
+    METRICS_QUERY_COUNT_THRESHOLD.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connect_query_wrapper()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, metrics)
+        return response
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, metrics)
+        return response
+
+    def _finish(self, request, response, metrics):
+        metrics.total_time = time.perf_counter() - metrics.started
+        match = request.resolver_match
+        view = match.view_name if match else UNRESOLVED
+        if view == "metrics":
+            return
+        registry.record(view, request.method, metrics)
+        if settings.METRICS_SERVER_TIMING:
+            response["Server-Timing"] = metrics.server_timing()
+        if metrics.queries > settings.METRICS_QUERY_COUNT_THRESHOLD:
+            logger.warning(
+                "%s %s (%s): %d SQL-запросов за %.1f мс, всего %.1f мс",
+                request.method,
+                request.path,
+                view,
+                metrics.queries,
+                metrics.db_time * 1000,
+                metrics.total_time * 1000,
+            )
+
+
+def metrics_view(request):
+    """
+    Отдаёт метрики процесса в текстовом формате Prometheus. Если задан
+    METRICS_TOKEN, требуется заголовок Authorization: Bearer <токен>.
+    """
+    if settings.METRICS_TOKEN and not constant_time_compare(
+        request.headers.get("Authorization", ""),
+        f"Bearer {settings.METRICS_TOKEN}",
+    ):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
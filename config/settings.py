@@ -17,6 +17,13 @@ ALLOWED_HOSTS = ["localhost", "127.0.0.1", "host.docker.internal"]
 AUTH_USER_MODEL = "users.User"
 
 
+# production — без приложений для разработки и, если не включено
+# API_DOCS_ENABLED, без drf_yasg: воркеры стартуют быстрее.
+SETTINGS_PROFILE = os.getenv("SETTINGS_PROFILE", "development")
+PRODUCTION = SETTINGS_PROFILE == "production"
+API_DOCS_ENABLED = os.getenv("API_DOCS_ENABLED", str(not PRODUCTION)) == "True"
+DEVELOPMENT_APPS = ["django_select2", "django_extensions"]
+
 INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
@@ -24,41 +31,78 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "django_select2",
     "django_filters",
     "corsheaders",
-    "drf_yasg",
+    *(["drf_yasg"] if API_DOCS_ENABLED else []),
     "rest_framework",
     "rest_framework_simplejwt",
     "users.apps.UsersConfig",
     "network.apps.NetworkConfig",
-    "django_extensions",
+    *([] if PRODUCTION else DEVELOPMENT_APPS),
 ]
 
+JWT_STATELESS_AUTH = os.getenv("JWT_STATELESS_AUTH", "False") == "True"
+JWT_REVOCATION_TTL = int(os.getenv("JWT_REVOCATION_TTL", 30))
+
 REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": ("rest_framework.views.exception_handler"),
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend"),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS_AUTH
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "users.permissions.IsActiveUser",
         "rest_framework.permissions.IsAuthenticated",
     ),
 }
+if PRODUCTION:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "rest_framework.renderers.JSONRenderer",
+    )
+
+# Версия кода для кеша схемы OpenAPI в памяти (по умолчанию — хеш модулей).
+CODE_VERSION = os.getenv("CODE_VERSION", "")
+# Адрес заранее выгруженной схемы (generate_openapi_schema): страницы
+# документации загружают её вместо сборки схемы воркером.
+API_SCHEMA_URL = os.getenv("API_SCHEMA_URL") or None
+SWAGGER_SETTINGS = {"SPEC_URL": API_SCHEMA_URL}
+REDOC_SETTINGS = {"SPEC_URL": API_SCHEMA_URL}
+SWAGGER_USE_COMPAT_RENDERERS = False
+
+NETWORK_PAGE_SIZE = int(os.getenv("NETWORK_PAGE_SIZE", 100))
+NETWORK_MAX_PAGE_SIZE = int(os.getenv("NETWORK_MAX_PAGE_SIZE", 1000))
+NETWORK_BULK_BATCH_SIZE = int(os.getenv("NETWORK_BULK_BATCH_SIZE", 1000))
+NETWORK_BULK_MAX_ROWS = int(os.getenv("NETWORK_BULK_MAX_ROWS", 50000))
+NETWORK_EXPORT_CHUNK_SIZE = int(os.getenv("NETWORK_EXPORT_CHUNK_SIZE", 2000))
+NETWORK_DEBT_ROLLUPS_ENABLED = (
+    os.getenv("NETWORK_DEBT_ROLLUPS_ENABLED", "False") == "True"
+)
+NETWORK_CACHE_ALIAS = "default"
+NETWORK_CACHE_TIMEOUT = int(os.getenv("NETWORK_CACHE_TIMEOUT", 300))
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60 * 2),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "False") == "True"
+METRICS_QUERY_COUNT_THRESHOLD = int(
+    os.getenv("METRICS_QUERY_COUNT_THRESHOLD", 50)
+)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 MIDDLEWARE = [
+    *(["config.metrics.MetricsMiddleware"] if METRICS_ENABLED else []),
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "config.db_router.ReplicaStickinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -94,17 +138,82 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 
+# Соединения с PostgreSQL: по умолчанию новое на каждый запрос,
+# DB_CONN_MAX_AGE > 0 — постоянные соединения с проверкой перед
+# повторным использованием, DB_POOL=True — пул psycopg 3 в каждом
+# процессе (CONN_MAX_AGE при этом должен быть 0).
+DB_POOL = os.getenv("DB_POOL", "False") == "True"
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", 0))
+DB_OPTIONS = {"connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", 5))}
+if DB_POOL:
+    from psycopg_pool import ConnectionPool
+
+    DB_OPTIONS["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", 1800)),
+        "check": ConnectionPool.check_connection,
+    }
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "ENGINE": "django.db.backends.postgresql",
         "NAME": os.getenv("POSTGRES_DB"),
         "USER": os.getenv("POSTGRES_USER"),
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("DB_HOST"),
         "PORT": os.getenv("DB_PORT"),
+        "CONN_MAX_AGE": 0 if DB_POOL else DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        # Нужно при pgbouncer в режиме transaction: курсоры на стороне
+        # сервера (QuerySet.iterator) не переживают смену соединения.
+        "DISABLE_SERVER_SIDE_CURSORS": (
+            os.getenv("DB_DISABLE_SERVER_SIDE_CURSORS", "False") == "True"
+        ),
+        "OPTIONS": DB_OPTIONS,
     }
 }
 
+# Реплики для чтения: DB_REPLICA_HOSTS=host1:5432,host2:5432. Безопасные
+# запросы звеньев сети и выгрузки читают из них, пользователь после
+# записи DATABASE_REPLICA_PIN_SECONDS секунд читает из основной базы.
+DATABASE_REPLICAS = []
+for number, address in enumerate(
+    filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1
+):
+    host, _, port = address.strip().partition(":")
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", 10))
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+# Ответы сети кешируются только в общем кеше: в LocMemCache у каждого
+# воркера gunicorn своя версия кеша, и другие воркеры отдают устаревшие
+# ответы.
+NETWORK_CACHE_ENABLED = os.getenv(
+    "NETWORK_CACHE_ENABLED",
+    str(
+        CACHES[NETWORK_CACHE_ALIAS]["BACKEND"]
+        != "django.core.cache.backends.locmem.LocMemCache"
+    ),
+) == "True"
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -147,3 +256,9 @@ EMAIL_USE_SSL = True
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = os.getenv("EMAIL_HOST_USER")
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 10))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_RETRY_DELAY", 60))
+EMAIL_OUTBOX_POLL_INTERVAL = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL", 5))
+EMAIL_OUTBOX_LEASE = int(os.getenv("EMAIL_OUTBOX_LEASE", 300))
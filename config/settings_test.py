@@ -17,6 +17,11 @@ ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
 AUTH_USER_MODEL = "users.User"
 
 
+API_DOCS_ENABLED = True
+CODE_VERSION = ""
+API_SCHEMA_URL = None
+SWAGGER_USE_COMPAT_RENDERERS = False
+
 INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
@@ -34,11 +39,16 @@ INSTALLED_APPS = [
     "network.apps.NetworkConfig",
 ]
 
+JWT_STATELESS_AUTH = os.getenv("JWT_STATELESS_AUTH", "False") == "True"
+JWT_REVOCATION_TTL = int(os.getenv("JWT_REVOCATION_TTL", 30))
+
 REST_FRAMEWORK = {
     "EXCEPTION_HANDLER": ("rest_framework.views.exception_handler"),
     "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend"),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS_AUTH
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -46,18 +56,38 @@ REST_FRAMEWORK = {
     ),
 }
 
+NETWORK_PAGE_SIZE = int(os.getenv("NETWORK_PAGE_SIZE", 100))
+NETWORK_MAX_PAGE_SIZE = int(os.getenv("NETWORK_MAX_PAGE_SIZE", 1000))
+NETWORK_BULK_BATCH_SIZE = int(os.getenv("NETWORK_BULK_BATCH_SIZE", 1000))
+NETWORK_BULK_MAX_ROWS = int(os.getenv("NETWORK_BULK_MAX_ROWS", 50000))
+NETWORK_EXPORT_CHUNK_SIZE = int(os.getenv("NETWORK_EXPORT_CHUNK_SIZE", 2000))
+NETWORK_DEBT_ROLLUPS_ENABLED = (
+    os.getenv("NETWORK_DEBT_ROLLUPS_ENABLED", "False") == "True"
+)
+NETWORK_CACHE_ALIAS = "default"
+NETWORK_CACHE_TIMEOUT = int(os.getenv("NETWORK_CACHE_TIMEOUT", 300))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60 * 2),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_SERVER_TIMING = os.getenv("METRICS_SERVER_TIMING", "False") == "True"
+METRICS_QUERY_COUNT_THRESHOLD = int(
+    os.getenv("METRICS_QUERY_COUNT_THRESHOLD", 50)
+)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 MIDDLEWARE = [
+    *(["config.metrics.MetricsMiddleware"] if METRICS_ENABLED else []),
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "config.db_router.ReplicaStickinessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -100,6 +130,37 @@ DATABASES = {
     }
 }
 
+# Реплика для тестов маршрутизации: тот же файл SQLite, в тестах —
+# зеркало default.
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "TEST": {"MIRROR": "default"},
+}
+DATABASE_REPLICAS = ["replica"]
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", 10))
+# Тесты выполняются в одном процессе, закреплению хватает LocMemCache.
+SILENCED_SYSTEM_CHECKS = ["config.E002"]
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+# Ответы сети кешируются только в общем кеше: в LocMemCache у каждого
+# воркера gunicorn своя версия кеша, и другие воркеры отдают устаревшие
+# ответы.
+NETWORK_CACHE_ENABLED = os.getenv(
+    "NETWORK_CACHE_ENABLED",
+    str(
+        CACHES[NETWORK_CACHE_ALIAS]["BACKEND"]
+        != "django.core.cache.backends.locmem.LocMemCache"
+    ),
+) == "True"
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -142,3 +203,9 @@ EMAIL_USE_SSL = True
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD")
 DEFAULT_FROM_EMAIL = os.getenv("EMAIL_HOST_USER")
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 10))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv("EMAIL_OUTBOX_RETRY_DELAY", 60))
+EMAIL_OUTBOX_POLL_INTERVAL = float(os.getenv("EMAIL_OUTBOX_POLL_INTERVAL", 5))
+EMAIL_OUTBOX_LEASE = int(os.getenv("EMAIL_OUTBOX_LEASE", 300))
@@ -1,39 +1,29 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="API Documentation",
-        default_version="v1",
-        description="API для сети по продаже электроники",
-        terms_of_service="https://www.example.com/policies/terms/",
-        contact=openapi.Contact(email="contact@example.com"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from config.api_docs import schema_ui
+from config.metrics import metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("users/", include("users.urls", namespace="users")),
     path("network/", include(
         ("network.urls", "network"),
         namespace="network")
     ),
 ]
-urlpatterns += [
-    path(
-        "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
-    path(
-        "redoc/",
-        schema_view.with_ui("redoc", cache_timeout=0),
-        name="schema-redoc",
-    ),
-]
+if settings.API_DOCS_ENABLED:
+    urlpatterns += [
+        path(
+            "swagger/",
+            schema_ui("swagger"),
+            name="schema-swagger-ui",
+        ),
+        path(
+            "redoc/",
+            schema_ui("redoc"),
+            name="schema-redoc",
+        ),
+    ]
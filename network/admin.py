@@ -1,11 +1,22 @@
-from decimal import Decimal
-
 from django import forms
 from django.contrib import admin, messages
 from django.urls import reverse
 from django.utils.html import format_html
 
-from .models import NetworkObject, Product
+from .models import CatalogProduct, DebtClearance, NetworkObject, Product
+from .search import FullTextSearchAdminMixin
+from .services import clear_debt, propagate_products
+
+
+def check_duplicate_product(product, **lookup):
+    """Не допускает повторного добавления продукта в ассортимент звена."""
+    if product.network_object_id is None:
+        return
+    duplicates = Product.objects.filter(
+        network_object_id=product.network_object_id, **lookup
+    ).exclude(pk=product.pk)
+    if duplicates.exists():
+        raise forms.ValidationError("Этот продукт уже есть у звена.")
 
 
 class ProductSelectorForm(forms.ModelForm):
@@ -46,7 +57,7 @@ class ProductSelectorForm(forms.ModelForm):
         if network_object and network_object.supplier:
             self.fields["product_selector"].queryset = Product.objects.filter(
                 network_object=network_object.supplier
-            )
+            ).select_related("catalog_product")
         else:
             self.fields["product_selector"].queryset = Product.objects.none()
 
@@ -58,9 +69,13 @@ class ProductSelectorForm(forms.ModelForm):
                 "Необходимо выбрать существующий продукт."
             )
         if product_selector:
-            cleaned_data["name"] = product_selector.name
-            cleaned_data["model"] = product_selector.model
-            cleaned_data["release_date"] = product_selector.release_date
+            self.instance.catalog_product_id = (
+                product_selector.catalog_product_id
+            )
+            check_duplicate_product(
+                self.instance,
+                catalog_product_id=product_selector.catalog_product_id,
+            )
         return cleaned_data
 
 
@@ -85,20 +100,38 @@ class ProductInlineFormSet(admin.TabularInline):
         return super().get_form(**kwargs)
 
 
+@admin.register(CatalogProduct)
+class CatalogProductAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
+    list_display = ("name", "model", "release_date")
+    search_fields = ("name", "model")
+
+
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = ("name", "model", "release_date", "network_object")
     list_filter = ("network_object__name",)
-    search_fields = ("name", "model", "release_date", "network_object")
+    list_select_related = ("catalog_product", "network_object")
+    search_fields = ("catalog_product__name", "catalog_product__model")
+    search_vector = "catalog_product__search_vector"
+    autocomplete_fields = ("catalog_product", "network_object")
 
 
 class ProductInlineForm(forms.ModelForm):
+    name = forms.CharField(max_length=255, label="Название продукта")
+    model = forms.CharField(max_length=255, label="Модель продукта")
+    release_date = forms.DateField(label="Дата выхода на рынок")
+
     class Meta:
         model = Product
         fields = ["name", "model", "release_date", "network_object"]
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if self.instance.catalog_product_id is not None:
+            for field in Product.CATALOG_FIELDS:
+                self.initial.setdefault(
+                    field, getattr(self.instance, field)
+                )
         if self.instance and self.instance.pk is None:
             if "network_object" in self.initial:
                 network_obj_instance = self.initial["network_object"]
@@ -117,11 +150,27 @@ class ProductInlineForm(forms.ModelForm):
 
     def clean(self):
         cleaned_data = super().clean()
+        values = {
+            field: cleaned_data[field]
+            for field in Product.CATALOG_FIELDS
+            if field in cleaned_data
+        }
+        for field, value in values.items():
+            setattr(self.instance, field, value)
+        if len(values) == len(Product.CATALOG_FIELDS):
+            check_duplicate_product(
+                self.instance,
+                **{
+                    f"catalog_product__{field}": value
+                    for field, value in values.items()
+                },
+            )
         return cleaned_data
 
 
 class ProductInline(admin.TabularInline):
     model = Product
+    form = ProductInlineForm
     extra = 1
     can_delete = True
     fk_name = "network_object"
@@ -133,11 +182,11 @@ class ProductInline(admin.TabularInline):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs
+        return qs.select_related("catalog_product")
 
 
 @admin.register(NetworkObject)
-class NetworkObjectAdmin(admin.ModelAdmin):
+class NetworkObjectAdmin(FullTextSearchAdminMixin, admin.ModelAdmin):
     list_display = (
         "name",
         "email",
@@ -148,8 +197,13 @@ class NetworkObjectAdmin(admin.ModelAdmin):
         "level_display",
         "created_at",
     )
-    list_filter = ("city",)
-    readonly_fields = ("created_at",)
+    list_filter = ("city", "level")
+    list_select_related = ("supplier",)
+    show_full_result_count = False
+    search_fields = ("name", "city")
+    autocomplete_fields = ("supplier",)
+    ordering = ("-created_at",)
+    readonly_fields = ("created_at", "level", "root_factory")
     inlines = [ProductInline]
 
     def supplier_link(self, obj):
@@ -157,7 +211,7 @@ class NetworkObjectAdmin(admin.ModelAdmin):
         if obj.supplier:
             link = reverse(
                 "admin:network_networkobject_change",
-                args=[obj.supplier.id]
+                args=[obj.supplier_id]
             )
             return format_html(
                 '<a href="{}">{}</a>',
@@ -172,24 +226,22 @@ class NetworkObjectAdmin(admin.ModelAdmin):
         return obj.get_level_display()
 
     level_display.short_description = "Уровень"
-    level_display.admin_order_field = "Level"
+    level_display.admin_order_field = "level"
 
-    actions = ["clear_debt"]
+    actions = ["clear_debt", "propagate_products"]
     """Admin action для очистки задолженности."""
 
     def clear_debt(self, request, queryset):
         """Метод для очистки задолженности перед поставщиком."""
-        update_count = 0
-        for obj in queryset:
-            if obj.debt_to_supplier > Decimal("0.00"):
-                obj.debt_to_supplier = Decimal("0.00")
-                obj.save()
-                update_count += 1
-        if update_count > 0:
+        clearance = clear_debt(
+            queryset, request.user, {"source": "admin", **request.GET.dict()}
+        )
+        if clearance is not None:
             self.message_user(
                 request,
-                f"Для {update_count} "
-                f"объектов задолженность перед поставщиком успешно очищена.",
+                f"Для {clearance.objects_count} "
+                f"объектов задолженность перед поставщиком успешно очищена "
+                f"на сумму {clearance.total_amount}.",
             )
         else:
             self.message_user(
@@ -199,3 +251,44 @@ class NetworkObjectAdmin(admin.ModelAdmin):
             )
 
     clear_debt.short_description = "Очистить задолженность перед поставщиком"
+
+    def propagate_products(self, request, queryset):
+        """Метод для передачи продуктов всем подчинённым звеньям."""
+        created = skipped = 0
+        for network_object in queryset.order_by("level", "pk"):
+            result = propagate_products(network_object)
+            created += result["created"]
+            skipped += result["skipped"]
+        self.message_user(
+            request,
+            f"Подчинённым звеньям передано продуктов: {created}, "
+            f"пропущено уже имеющихся: {skipped}.",
+        )
+
+    propagate_products.short_description = (
+        "Передать продукты всем подчинённым"
+    )
+
+
+@admin.register(DebtClearance)
+class DebtClearanceAdmin(admin.ModelAdmin):
+    list_display = (
+        "created_at",
+        "cleared_by",
+        "objects_count",
+        "total_amount",
+    )
+    list_select_related = ("cleared_by",)
+    readonly_fields = (
+        "created_at",
+        "cleared_by",
+        "objects_count",
+        "total_amount",
+        "filters",
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
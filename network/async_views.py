@@ -0,0 +1,176 @@
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.http import parse_etags
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from config.db_router import is_pinned, read_from_replica
+
+from .filters import NetworkObjectFilter
+from .models import NetworkObject
+from .paginators import NetworkObjectCursorPagination
+from .search import SEARCH_PARAM, full_text_search
+from .serializers import NetworkObjectSerializer
+from .services import abuild_supplier_tree
+from .views import NetworkObjectViewSet, content_etag, tree_etag
+
+
+def _json_response(data, status_code=status.HTTP_200_OK):
+    return JsonResponse(
+        data,
+        status=status_code,
+        safe=False,
+        encoder=DjangoJSONEncoder,
+        json_dumps_params={"ensure_ascii": False},
+    )
+
+
+def _check_permissions(request):
+    """
+    Аутентифицирует запрос и проверяет разрешения по умолчанию API.
+    Возвращает True, если чтения запроса можно направить в реплики.
+    """
+    for permission_class in api_settings.DEFAULT_PERMISSION_CLASSES:
+        if permission_class().has_permission(request, None):
+            continue
+        if not request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied()
+    return not is_pinned(request.user)
+
+
+def async_api_view(view):
+    """
+    Оборачивает асинхронное представление чтения: аутентификация и
+    разрешения — как у API, ошибки API — в формате DRF, чтения — из
+    реплик, как у синхронного API.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "GET":
+            return _json_response(
+                {"detail": f'Метод "{request.method}" не разрешен.'},
+                status.HTTP_405_METHOD_NOT_ALLOWED,
+            )
+        request = Request(
+            request,
+            authenticators=[
+                authentication_class()
+                for authentication_class in (
+                    api_settings.DEFAULT_AUTHENTICATION_CLASSES
+                )
+            ],
+        )
+        try:
+            replica = await sync_to_async(_check_permissions)(request)
+            with read_from_replica(replica):
+                return await view(request, *args, **kwargs)
+        except exceptions.APIException as error:
+            data = error.detail
+            if not isinstance(data, (list, dict)):
+                data = {"detail": data}
+            return _json_response(data, error.status_code)
+
+    return wrapper
+
+
+def _filter_queryset(request, paginator, view):
+    filterset = NetworkObjectFilter(
+        request.query_params,
+        queryset=NetworkObject.objects.defer("search_vector"),
+        request=request,
+    )
+    if not filterset.is_valid():
+        raise exceptions.ValidationError(filterset.errors)
+    queryset = full_text_search(
+        filterset.qs,
+        request.query_params.get(SEARCH_PARAM, ""),
+        "search_vector",
+        ("name", "city"),
+    )
+    only_fields = NetworkObjectSerializer.get_only_fields(request)
+    if only_fields is None:
+        return queryset
+    ordering = paginator.get_ordering(request, queryset, view)
+    only_fields.update(field.lstrip("-") for field in ordering)
+    only_fields.add("id")
+    return queryset.only(*only_fields)
+
+
+async def _get_network_object(pk):
+    try:
+        return await NetworkObject.objects.aget(pk=pk)
+    except NetworkObject.DoesNotExist:
+        raise exceptions.NotFound()
+
+
+@async_api_view
+async def network_object_list(request):
+    """
+    Асинхронный список звеньев сети с фильтрами, поиском ?search=,
+    ?fields= и постраничным выводом по ключу, как у синхронного списка,
+    но без кеша ответов. Сортировка ?ordering= — по тем же полям.
+    """
+    paginator = NetworkObjectCursorPagination()
+    view = NetworkObjectViewSet(action="list")
+    queryset = await sync_to_async(_filter_queryset)(
+        request, paginator, view
+    )
+    page = await paginator.apaginate_queryset(queryset, request, view)
+    serializer = NetworkObjectSerializer(
+        page, many=True, context={"request": request}
+    )
+    response = paginator.get_paginated_response(serializer.data)
+    return _json_response(response.data)
+
+
+@async_api_view
+async def network_object_detail(request, pk):
+    """Асинхронно возвращает одно звено сети."""
+    instance = await _get_network_object(pk)
+    serializer = NetworkObjectSerializer(
+        instance, context={"request": request}
+    )
+    return _json_response(serializer.data)
+
+
+@async_api_view
+async def network_object_tree(request, pk):
+    """
+    Асинхронно возвращает дерево подчинённых звена с параметрами depth
+    и products и условным запросом по If-None-Match.
+    """
+    depth = request.query_params.get("depth")
+    if depth is not None:
+        if not depth.isdigit():
+            raise exceptions.ValidationError(
+                {"depth": "Ожидается неотрицательное целое число."}
+            )
+        depth = int(depth)
+    with_products = request.query_params.get("products") in ("1", "true")
+    build = partial(
+        abuild_supplier_tree,
+        await _get_network_object(pk),
+        NetworkObjectSerializer,
+        {"request": request},
+        depth=depth,
+        with_products=with_products,
+    )
+    if settings.NETWORK_CACHE_ENABLED:
+        tree = None
+        etag = await sync_to_async(tree_etag)(request)
+    else:
+        tree = await build()
+        etag = content_etag(tree)
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = _json_response(await build() if tree is None else tree)
+    response["ETag"] = etag
+    return response
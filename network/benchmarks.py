@@ -0,0 +1,251 @@
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from itertools import cycle
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .cache import invalidate_network_cache
+from .models import NetworkObject
+from .validators import check_supplier_chains
+
+SCENARIOS = (
+    "api_list",
+    "api_list_cached",
+    "api_retrieve",
+    "api_create",
+    "api_bulk",
+    "admin_changelist",
+    "chain_validation",
+)
+
+
+class BenchmarkError(Exception):
+    """Сценарий нельзя выполнить на данных текущей базы."""
+
+
+def _percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[
+        percent - 1
+    ]
+
+
+def _milliseconds(seconds):
+    return round(seconds * 1000, 3)
+
+
+@contextmanager
+def _rolled_back():
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def _expect(response, status_code):
+    if response.status_code != status_code:
+        raise BenchmarkError(
+            f"{response.request['PATH_INFO']}: ожидался код "
+            f"{status_code}, получен {response.status_code}."
+        )
+
+
+class NetworkBenchmark:
+    """
+    Замеряет горячие пути сети на данных текущей базы: задержку каждого
+    прогона, число запросов и пиковую память одного прогона.
+
+    Запросы выполняются тестовым клиентом Django в процессе, поэтому
+    в задержку входят middleware, представления и ORM, но не сеть и
+    не WSGI-сервер. Кеш ответов сбрасывается перед каждым запросом,
+    кроме сценария api_list_cached. Все изменения откатываются.
+    """
+
+    def __init__(self, iterations=50, warmup=5, bulk_size=100):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.bulk_size = bulk_size
+
+    def setup(self):
+        factories = NetworkObject.objects.filter(
+            level=NetworkObject.Level.FACTORY
+        ).order_by("pk")
+        retail = NetworkObject.objects.filter(
+            level=NetworkObject.Level.RETAIL_NETWORK
+        ).order_by("pk")
+        self.factory_ids = list(
+            factories.values_list("pk", flat=True)[:self.bulk_size]
+        )
+        self.retail_ids = list(
+            retail.values_list("pk", flat=True)[:self.bulk_size]
+        )
+        if not self.factory_ids or not self.retail_ids:
+            raise BenchmarkError(
+                "Нужны заводы и розничные сети: запустите seed_network."
+            )
+        self.object_ids = cycle(
+            NetworkObject.objects.order_by("-pk").values_list(
+                "pk", flat=True
+            )[:self.iterations]
+        )
+        user = get_user_model().objects.create(
+            username="benchmark",
+            email="benchmark@benchmark.invalid",
+            is_staff=True,
+            is_superuser=True,
+        )
+        self.api = APIClient()
+        self.api.force_authenticate(user=user)
+        self.admin = Client()
+        self.admin.force_login(user)
+
+    def api_list(self):
+        invalidate_network_cache()
+        _expect(
+            self.api.get(reverse("network:network_objects-list")), 200
+        )
+
+    def api_list_cached(self):
+        _expect(
+            self.api.get(reverse("network:network_objects-list")), 200
+        )
+
+    def api_retrieve(self):
+        url = reverse(
+            "network:network_objects-detail", args=[next(self.object_ids)]
+        )
+        invalidate_network_cache()
+        _expect(self.api.get(url), 200)
+
+    def api_create(self):
+        data = {
+            "name": "Сеть бенчмарка",
+            "email": "benchmark@example.com",
+            "country": "Россия",
+            "city": "Москва",
+            "street": "Тестовая",
+            "house_number": "1",
+            "supplier": self.factory_ids[0],
+        }
+        with _rolled_back():
+            _expect(
+                self.api.post(
+                    reverse("network:network_objects-list"),
+                    data,
+                    format="json",
+                ),
+                201,
+            )
+
+    def api_bulk(self):
+        rows = [
+            {
+                "name": f"ИП бенчмарка {number}",
+                "country": "Россия",
+                "city": "Москва",
+                "street": "Тестовая",
+                "house_number": "1",
+                "supplier": supplier_id,
+            }
+            for number, supplier_id in zip(
+                range(self.bulk_size), cycle(self.retail_ids)
+            )
+        ]
+        with _rolled_back():
+            _expect(
+                self.api.post(
+                    reverse("network:network_objects-bulk"),
+                    rows,
+                    format="json",
+                ),
+                200,
+            )
+
+    def admin_changelist(self):
+        _expect(
+            self.admin.get(
+                reverse("admin:network_networkobject_changelist")
+            ),
+            200,
+        )
+
+    def chain_validation(self):
+        candidates = [
+            NetworkObject(supplier_id=supplier_id)
+            for _, supplier_id in zip(
+                range(self.bulk_size),
+                cycle(self.factory_ids + self.retail_ids),
+            )
+        ]
+        check_supplier_chains(candidates)
+
+    def measure(self, scenario):
+        """Возвращает сводку замеров одного сценария."""
+        run = getattr(self, scenario)
+        for _ in range(self.warmup):
+            run()
+        latencies = []
+        for _ in range(self.iterations):
+            started = time.perf_counter()
+            run()
+            latencies.append(time.perf_counter() - started)
+        with CaptureQueriesContext(connection) as queries:
+            tracemalloc.start()
+            try:
+                run()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        return {
+            "queries": len(queries),
+            "p50_ms": _milliseconds(_percentile(latencies, 50)),
+            "p95_ms": _milliseconds(_percentile(latencies, 95)),
+            "p99_ms": _milliseconds(_percentile(latencies, 99)),
+            "max_ms": _milliseconds(max(latencies)),
+            "peak_memory_kb": round(peak / 1024, 1),
+        }
+
+    def run(self, scenarios=SCENARIOS):
+        """
+        Выполняет сценарии в транзакции, которая откатывается вместе
+        с пользователем бенчмарка и созданными звеньями.
+        """
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            with _rolled_back():
+                self.setup()
+                return {
+                    scenario: self.measure(scenario)
+                    for scenario in scenarios
+                }
+
+
+def find_regressions(baseline, current, threshold):
+    """
+    Сравнивает результаты с базовыми и возвращает список регрессий:
+    рост числа запросов или медианы задержки больше чем на threshold
+    процентов.
+    """
+    regressions = []
+    for scenario, result in current.items():
+        before = baseline.get(scenario)
+        if before is None:
+            continue
+        if result["queries"] > before["queries"]:
+            regressions.append(
+                f"{scenario}: запросов {before['queries']} → "
+                f"{result['queries']}"
+            )
+        limit = before["p50_ms"] * (1 + threshold / 100)
+        if result["p50_ms"] > limit:
+            regressions.append(
+                f"{scenario}: p50 {before['p50_ms']} → "
+                f"{result['p50_ms']} мс"
+            )
+    return regressions
@@ -0,0 +1,128 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from config.db_router import is_pinned, reads_from_replica
+
+VERSION_KEY = "network:version"
+HITS_KEY = "network:stats:hits"
+MISSES_KEY = "network:stats:misses"
+
+
+def get_cache():
+    return caches[settings.NETWORK_CACHE_ALIAS]
+
+
+def get_version():
+    """Возвращает текущую версию кеша ответов сети."""
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.add(VERSION_KEY, version, timeout=None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def _bump_version():
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_network_cache():
+    """
+    Делает недействительными все закешированные ответы сети.
+
+    Версия увеличивается сразу и ещё раз после фиксации транзакции,
+    чтобы ответ, закешированный до фиксации, не пережил её.
+    """
+    _bump_version()
+    transaction.on_commit(_bump_version)
+
+
+def _incr(key):
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_cache_stats():
+    """Возвращает счётчики попаданий и промахов кеша ответов."""
+    values = get_cache().get_many([HITS_KEY, MISSES_KEY])
+    hits = values.get(HITS_KEY, 0)
+    misses = values.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+        "version": get_version(),
+    }
+
+
+def build_cache_key(request, action):
+    """
+    Строит ключ ответа по действию, пути, параметрам запроса
+    и области пользователя.
+    """
+    scope = "staff" if request.user.is_staff else "user"
+    params = "&".join(
+        f"{name}={value}"
+        for name, values in sorted(request.query_params.lists())
+        for value in values
+    )
+    raw = f"{action}|{request.path}|{params}|{scope}"
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+    return f"network:response:{get_version()}:{digest}"
+
+
+class CachedResponseMixin:
+    """
+    Кеширует ответы list и retrieve с версионной инвалидацией.
+
+    Пользователь, недавно писавший в базу, читает мимо кеша: ответ,
+    закешированный другим пользователем, может быть собран из
+    отстающей реплики. По той же причине сохраняются только ответы,
+    прочитанные из основной базы.
+
+    При NETWORK_CACHE_ENABLED=False (по умолчанию для LocMemCache,
+    не общего для воркеров) ответы не кешируются.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not settings.NETWORK_CACHE_ENABLED:
+            return handler(request, *args, **kwargs)
+        cache = get_cache()
+        key = build_cache_key(request, self.action)
+        data = None if is_pinned(request.user) else cache.get(key)
+        if data is not None:
+            _incr(HITS_KEY)
+            response = Response(data)
+            response["X-Cache"] = "HIT"
+            return response
+        _incr(MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and not reads_from_replica():
+            cache.set(key, response.data, settings.NETWORK_CACHE_TIMEOUT)
+        response["X-Cache"] = "MISS"
+        return response
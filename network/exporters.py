@@ -0,0 +1,83 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import NetworkObject, Product
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+NETWORK_OBJECT_COLUMNS = {
+    "id": "id",
+    "name": "name",
+    "email": "email",
+    "country": "country",
+    "city": "city",
+    "street": "street",
+    "house_number": "house_number",
+    "supplier_id": "supplier_id",
+    "supplier_name": "supplier__name",
+    "root_factory_id": "root_factory_id",
+    "level": "level",
+    "debt_to_supplier": "debt_to_supplier",
+    "created_at": "created_at",
+}
+
+PRODUCT_COLUMNS = {
+    "id": "id",
+    "name": "catalog_product__name",
+    "model": "catalog_product__model",
+    "release_date": "catalog_product__release_date",
+    "catalog_product_id": "catalog_product_id",
+    "network_object_id": "network_object_id",
+    "network_object_name": "network_object__name",
+}
+
+DATASETS = {
+    "network_objects": (NetworkObject.objects.all, NETWORK_OBJECT_COLUMNS),
+    "products": (Product.objects.all, PRODUCT_COLUMNS),
+}
+
+
+class _Echo:
+    """Буфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(dataset, queryset=None, chunk_size=None):
+    """
+    Построчно выгружает набор данных одним запросом с JOIN поставщика,
+    читая результат порциями через QuerySet.iterator().
+    """
+    get_queryset, columns = DATASETS[dataset]
+    if queryset is None:
+        queryset = get_queryset()
+    chunk_size = chunk_size or settings.NETWORK_EXPORT_CHUNK_SIZE
+    rows = queryset.order_by("pk").values_list(*columns.values())
+    for values in rows.iterator(chunk_size=chunk_size):
+        yield dict(zip(columns, values))
+
+
+def stream_export(dataset, file_format, queryset=None, chunk_size=None):
+    """Возвращает генератор строк выгрузки в формате CSV или NDJSON."""
+    columns = DATASETS[dataset][1]
+    rows = export_rows(dataset, queryset, chunk_size)
+    if file_format == "ndjson":
+        return (
+            json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(list(columns))
+        for row in rows:
+            yield writer.writerow(row.values())
+
+    return lines()
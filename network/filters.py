@@ -0,0 +1,32 @@
+from django_filters import rest_framework as filters
+
+from .models import NetworkObject, Product
+
+
+class NetworkObjectFilter(filters.FilterSet):
+    """Фильтры звеньев сети по адресу, уровню и поставщику."""
+
+    class Meta:
+        model = NetworkObject
+        fields = ["country", "city", "level", "supplier"]
+
+
+class ProductFilter(filters.FilterSet):
+    """
+    Фильтры продуктов по названию и модели (без учёта регистра,
+    по вхождению), интервалу дат выхода и звену сети.
+    """
+
+    name = filters.CharFilter(
+        field_name="catalog_product__name", lookup_expr="icontains"
+    )
+    model = filters.CharFilter(
+        field_name="catalog_product__model", lookup_expr="icontains"
+    )
+    release_date = filters.DateFromToRangeFilter(
+        field_name="catalog_product__release_date"
+    )
+
+    class Meta:
+        model = Product
+        fields = ["name", "model", "release_date", "network_object"]
@@ -0,0 +1,103 @@
+import json
+import os
+import subprocess
+from datetime import datetime, timezone
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+
+from network.benchmarks import (SCENARIOS, BenchmarkError, NetworkBenchmark,
+                                find_regressions)
+from network.models import NetworkObject, Product
+
+
+def _commit():
+    commit = os.getenv("GIT_COMMIT")
+    if commit:
+        return commit
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """
+    Замеряет список, чтение, создание и пакетную загрузку звеньев через
+    API, список звеньев в админке и проверку цепочек поставщиков.
+    Результат — JSON для сравнения между коммитами.
+    """
+
+    help = "Бенчмарк горячих путей сети на данных текущей базы."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument(
+            "--bulk-size",
+            type=int,
+            default=100,
+            help="Строк в пакетной загрузке и проверке цепочек.",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=SCENARIOS,
+            help="Сценарий; можно указать несколько раз. "
+            "По умолчанию — все.",
+        )
+        parser.add_argument(
+            "--output", help="Файл для JSON. По умолчанию — stdout."
+        )
+        parser.add_argument(
+            "--baseline", help="JSON предыдущего запуска для сравнения."
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=20,
+            help="Допустимый рост p50 относительно baseline, %%.",
+        )
+
+    def handle(self, *args, **options):
+        benchmark = NetworkBenchmark(
+            iterations=options["iterations"],
+            warmup=options["warmup"],
+            bulk_size=options["bulk_size"],
+        )
+        try:
+            scenarios = benchmark.run(options["scenario"] or SCENARIOS)
+        except BenchmarkError as error:
+            raise CommandError(str(error))
+        report = {
+            "commit": _commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "network_objects": NetworkObject.objects.count(),
+            "products": Product.objects.count(),
+            "iterations": options["iterations"],
+            "scenarios": scenarios,
+        }
+        payload = json.dumps(report, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.write(payload + "\n")
+        else:
+            self.stdout.write(payload)
+        if not options["baseline"]:
+            return
+        with open(options["baseline"], encoding="utf-8") as baseline:
+            regressions = find_regressions(
+                json.load(baseline)["scenarios"],
+                scenarios,
+                options["threshold"],
+            )
+        for regression in regressions:
+            self.stderr.write(self.style.ERROR(regression))
+        if regressions:
+            raise CommandError("Обнаружены регрессии производительности.")
@@ -0,0 +1,48 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from network.query_plans import analyze_tables, find_missing_indexes
+from network.seeding import seed_network
+
+
+class Command(BaseCommand):
+    """
+    Проверяет, что горячие запросы API и админки сети используют
+    ожидаемые индексы. Запросы строятся представлениями и админкой,
+    планы — на данных текущей базы или на тестовой сети (--factories),
+    которая создаётся на время проверки и откатывается.
+    """
+
+    help = "Проверка планов горячих запросов сети."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--factories",
+            type=int,
+            default=0,
+            help="Заводов в тестовой сети; 0 — данные текущей базы.",
+        )
+        parser.add_argument(
+            "--fan-out",
+            type=int,
+            default=10,
+            help="Подчинённых у каждого завода и розничной сети.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["factories"]:
+                seed_network(options["factories"], options["fan_out"], 5)
+            analyze_tables()
+            problems = find_missing_indexes()
+            transaction.set_rollback(True)
+        for name, (index, plan) in problems.items():
+            self.stdout.write(
+                self.style.ERROR(f"{name}: не используется индекс {index}")
+            )
+            self.stdout.write(plan)
+        if problems:
+            raise CommandError("Найдены запросы без ожидаемых индексов.")
+        self.stdout.write(
+            self.style.SUCCESS("Все запросы используют ожидаемые индексы.")
+        )
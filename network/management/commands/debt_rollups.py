@@ -0,0 +1,43 @@
+import json
+
+from django.core.management import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+
+from network.rollups import get_debt_rollups, rebuild_debt_rollups
+from network.serializers import DebtRollupSerializer
+
+
+class Command(BaseCommand):
+    """
+    Выводит задолженность перед поставщиками и заводами или
+    перестраивает сводную таблицу задолженности.
+    """
+
+    help = "Сводная задолженность по поставщикам и заводам."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--factories",
+            action="store_true",
+            help="Вывести только заводы.",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Полностью перестроить сводную таблицу.",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            count = rebuild_debt_rollups()
+            self.stdout.write(
+                self.style.SUCCESS(f"Сводная таблица перестроена: {count}.")
+            )
+            return
+        level = 0 if options["factories"] else None
+        for row in DebtRollupSerializer(
+            get_debt_rollups(level), many=True
+        ).data:
+            self.stdout.write(
+                json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False)
+            )
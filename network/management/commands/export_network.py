@@ -0,0 +1,47 @@
+from django.core.management import BaseCommand
+
+from config.db_router import read_from_replica
+from network.exporters import DATASETS, EXPORT_FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    """
+    Выгружает звенья сети или продукты в CSV или NDJSON
+    с постоянным расходом памяти. Читает из реплик, если они настроены.
+    """
+
+    help = "Потоковая выгрузка сети поставщиков для аналитики."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dataset", choices=list(DATASETS), default="network_objects"
+        )
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=list(EXPORT_FORMATS),
+            default="csv",
+        )
+        parser.add_argument(
+            "--output", help="Путь к файлу. По умолчанию — stdout."
+        )
+        parser.add_argument("--chunk-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        with read_from_replica():
+            self.export(options)
+
+    def export(self, options):
+        lines = stream_export(
+            options["dataset"],
+            options["file_format"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"]:
+            with open(
+                options["output"], "w", encoding="utf-8", newline=""
+            ) as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from config.api_docs import generate_schema
+
+SCHEMA_FORMATS = ("json", "yaml")
+
+
+class Command(BaseCommand):
+    """
+    Записывает схему OpenAPI в статические файлы schema.json
+    и schema.yaml, которые отдаёт nginx без обращения к приложению.
+    """
+
+    help = "Выгрузка схемы OpenAPI в статические файлы."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output-dir",
+            default=None,
+            help="Каталог для файлов. По умолчанию — STATIC_ROOT/openapi.",
+        )
+        parser.add_argument(
+            "--format",
+            dest="formats",
+            action="append",
+            choices=SCHEMA_FORMATS,
+            help="Формат файла, можно указать несколько. По умолчанию — все.",
+        )
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="Базовый адрес API в схеме, например https://example.com.",
+        )
+
+    def handle(self, *args, **options):
+        from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+
+        codecs = {"json": OpenAPICodecJson, "yaml": OpenAPICodecYaml}
+        output_dir = Path(
+            options["output_dir"] or Path(settings.STATIC_ROOT) / "openapi"
+        )
+        output_dir.mkdir(parents=True, exist_ok=True)
+        schema = generate_schema(url=options["url"])
+        for schema_format in options["formats"] or SCHEMA_FORMATS:
+            path = output_dir / f"schema.{schema_format}"
+            path.write_bytes(
+                codecs[schema_format](validators=[]).encode(schema)
+            )
+            self.stdout.write(f"{path}: {path.stat().st_size} байт")
@@ -0,0 +1,49 @@
+from django.core.management import BaseCommand
+
+from network.seeding import seed_network
+
+
+class Command(BaseCommand):
+    """
+    Заполняет базу тестовой сетью для нагрузочного тестирования
+    и бенчмарков.
+    """
+
+    help = "Генерация тестовой сети поставщиков пачками bulk_create."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--factories", type=int, default=100, help="Число заводов."
+        )
+        parser.add_argument(
+            "--fan-out",
+            type=int,
+            default=10,
+            help="Подчинённых у каждого завода и розничной сети.",
+        )
+        parser.add_argument(
+            "--products",
+            type=int,
+            default=5,
+            help="Продуктов в ассортименте каждого звена.",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Зерно генератора."
+        )
+
+    def handle(self, *args, **options):
+        result = seed_network(
+            options["factories"],
+            options["fan_out"],
+            options["products"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано звеньев: {result['network_objects']}, "
+                f"моделей каталога: {result['catalog_products']}, "
+                f"строк ассортимента: {result['products']}."
+            )
+        )
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def materialize_hierarchy(apps, schema_editor):
+    NetworkObject = apps.get_model("network", "NetworkObject")
+    frontier = list(
+        NetworkObject.objects.filter(supplier__isnull=True).values_list(
+            "pk", flat=True
+        )
+    )
+    NetworkObject.objects.filter(pk__in=frontier).update(
+        level=0, path="", root_factory=None
+    )
+    level = 0
+    while frontier and level < 2:
+        level += 1
+        children = list(
+            NetworkObject.objects.filter(supplier_id__in=frontier).only(
+                "pk", "supplier_id"
+            )
+        )
+        parents = NetworkObject.objects.in_bulk(
+            [child.supplier_id for child in children]
+        )
+        for child in children:
+            parent = parents[child.supplier_id]
+            child.level = level
+            child.root_factory_id = parent.root_factory_id or parent.pk
+            child.path = f"{parent.path}{parent.pk}/"
+        NetworkObject.objects.bulk_update(
+            children, ["level", "root_factory", "path"], batch_size=1000
+        )
+        frontier = [child.pk for child in children]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="networkobject",
+            name="level",
+            field=models.PositiveSmallIntegerField(
+                choices=[
+                    (0, "Завод"),
+                    (1, "Розничная сеть"),
+                    (2, "Индивидуальный предприниматель"),
+                ],
+                default=0,
+                editable=False,
+                verbose_name="Уровень иерархии",
+            ),
+        ),
+        migrations.AddField(
+            model_name="networkobject",
+            name="path",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Идентификаторы поставщиков от завода, например «1/5/».",
+                max_length=255,
+                verbose_name="Цепочка поставщиков",
+            ),
+        ),
+        migrations.AddField(
+            model_name="networkobject",
+            name="root_factory",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="network.networkobject",
+                verbose_name="Завод во главе цепочки",
+            ),
+        ),
+        migrations.RunPython(materialize_hierarchy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0002_networkobject_hierarchy"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DebtClearance",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "objects_count",
+                    models.PositiveIntegerField(
+                        verbose_name="Количество звеньев"
+                    ),
+                ),
+                (
+                    "total_amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        max_digits=18,
+                        verbose_name="Сумма очищенной задолженности",
+                    ),
+                ),
+                (
+                    "filters",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Условия отбора"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Время очистки"
+                    ),
+                ),
+                (
+                    "cleared_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="debt_clearances",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Очистка задолженности",
+                "verbose_name_plural": "Журнал очистки задолженности",
+                "ordering": ("-created_at",),
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:13
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+TRIGRAM_INDEXES = [
+    ("network_obj_name_trgm", "network_networkobject", "name"),
+    ("network_obj_city_trgm", "network_networkobject", "city"),
+    ("network_product_name_trgm", "network_product", "name"),
+    ("network_product_model_trgm", "network_product", "model"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Создаёт GIN-индексы pg_trgm под поиск icontains, который Django
+    выполняет как UPPER(column) LIKE UPPER(%s). Только для PostgreSQL.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0003_debtclearance"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="networkobject",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="network_obj_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkobject",
+            index=models.Index(
+                fields=["country", "-created_at", "-id"],
+                name="network_obj_country_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkobject",
+            index=models.Index(
+                fields=["city", "-created_at"], name="network_obj_city_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkobject",
+            index=models.Index(fields=["name"], name="network_obj_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="networkobject",
+            index=models.Index(
+                fields=["path"],
+                name="network_obj_path_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="networkobject",
+            index=models.Index(
+                condition=models.Q(("debt_to_supplier__gt", Decimal("0.00"))),
+                fields=["debt_to_supplier"],
+                name="network_obj_debt_idx",
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
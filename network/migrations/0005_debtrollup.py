@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-18 16:15
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0004_hot_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DebtRollup",
+            fields=[
+                (
+                    "network_object",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="debt_rollup",
+                        serialize=False,
+                        to="network.networkobject",
+                        verbose_name="Звено сети",
+                    ),
+                ),
+                (
+                    "direct_debt",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        max_digits=18,
+                        verbose_name="Долг прямых подчинённых",
+                    ),
+                ),
+                (
+                    "total_debt",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        max_digits=18,
+                        verbose_name="Долг всего дерева",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Время пересчёта"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Сводная задолженность",
+                "verbose_name_plural": "Сводная задолженность",
+            },
+        ),
+    ]
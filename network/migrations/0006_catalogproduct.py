@@ -0,0 +1,210 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+
+CATALOG_FIELDS = ("name", "model", "release_date")
+
+TRIGRAM_INDEXES = [
+    ("network_catalog_name_trgm", "network_catalogproduct", "name"),
+    ("network_catalog_model_trgm", "network_catalogproduct", "model"),
+]
+
+
+def fill_catalog(apps, schema_editor):
+    """
+    Переносит модели продуктов в каталог по одной строке на модель,
+    привязывает к ним строки ассортимента и удаляет повторы модели
+    у одного звена.
+    """
+    Product = apps.get_model("network", "Product")
+    CatalogProduct = apps.get_model("network", "CatalogProduct")
+    rows = (
+        Product.objects.order_by()
+        .values_list(*CATALOG_FIELDS)
+        .distinct()
+        .iterator(chunk_size=2000)
+    )
+    CatalogProduct.objects.bulk_create(
+        (CatalogProduct(**dict(zip(CATALOG_FIELDS, row))) for row in rows),
+        batch_size=1000,
+    )
+    Product.objects.update(
+        catalog_product=Subquery(
+            CatalogProduct.objects.filter(
+                **{field: OuterRef(field) for field in CATALOG_FIELDS}
+            ).values("pk")[:1]
+        )
+    )
+    duplicates = (
+        Product.objects.order_by()
+        .values("network_object", "catalog_product")
+        .annotate(keep=Max("pk"), count=Count("pk"))
+        .filter(count__gt=1)
+    )
+    for group in duplicates.iterator():
+        Product.objects.filter(
+            network_object=group["network_object"],
+            catalog_product=group["catalog_product"],
+        ).exclude(pk=group["keep"]).delete()
+
+
+def restore_product_fields(apps, schema_editor):
+    Product = apps.get_model("network", "Product")
+    CatalogProduct = apps.get_model("network", "CatalogProduct")
+    Product.objects.update(
+        **{
+            field: Subquery(
+                CatalogProduct.objects.filter(
+                    pk=OuterRef("catalog_product")
+                ).values(field)[:1]
+            )
+            for field in CATALOG_FIELDS
+        }
+    )
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """GIN-индексы pg_trgm под поиск icontains по каталогу."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0005_debtrollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogProduct",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=255, verbose_name="Название продукта"
+                    ),
+                ),
+                (
+                    "model",
+                    models.CharField(
+                        max_length=255, verbose_name="Модель продукта"
+                    ),
+                ),
+                (
+                    "release_date",
+                    models.DateField(verbose_name="Дата выхода на рынок"),
+                ),
+            ],
+            options={
+                "verbose_name": "Продукт каталога",
+                "verbose_name_plural": "Каталог продуктов",
+                "ordering": ("name", "model"),
+                "indexes": [
+                    models.Index(
+                        fields=["model"], name="network_catalog_model_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("name", "model", "release_date"),
+                        name="network_catalog_unique_product",
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="catalog_product",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="assortment",
+                to="network.catalogproduct",
+                verbose_name="Продукт каталога",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="name",
+            field=models.CharField(
+                max_length=255, null=True, verbose_name="Название продукта"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="model",
+            field=models.CharField(
+                max_length=255, null=True, verbose_name="Модель продукта"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="product",
+            name="release_date",
+            field=models.DateField(
+                null=True, verbose_name="Дата выхода на рынок"
+            ),
+        ),
+        migrations.RunPython(fill_catalog, restore_product_fields),
+        migrations.RemoveField(model_name="product", name="name"),
+        migrations.RemoveField(model_name="product", name="model"),
+        migrations.RemoveField(model_name="product", name="release_date"),
+        migrations.AlterField(
+            model_name="product",
+            name="catalog_product",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="assortment",
+                to="network.catalogproduct",
+                verbose_name="Продукт каталога",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="product",
+            constraint=models.UniqueConstraint(
+                fields=("network_object", "catalog_product"),
+                name="network_product_unique_assortment",
+            ),
+        ),
+        migrations.AlterModelOptions(
+            name="product",
+            options={
+                "verbose_name": "Продукт",
+                "verbose_name_plural": "Продукты",
+            },
+        ),
+        migrations.AddField(
+            model_name="networkobject",
+            name="assortment",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="network_objects",
+                through="network.Product",
+                to="network.catalogproduct",
+                verbose_name="Ассортимент",
+            ),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,105 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_CONFIG = "russian"
+
+SEARCH_TRIGGERS = {
+    "network_networkobject": [
+        ("name", "A"),
+        ("city", "B"),
+        ("country", "C"),
+    ],
+    "network_catalogproduct": [
+        ("name", "A"),
+        ("model", "A"),
+    ],
+}
+
+SEARCH_INDEXES = {
+    "network_networkobject": "network_obj_search_idx",
+    "network_catalogproduct": "network_catalog_search_idx",
+}
+
+
+def _vector_sql(columns, record):
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+        f"coalesce({record}{column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+
+
+def create_search_triggers(apps, schema_editor):
+    """
+    Создаёт триггеры, которые пересчитывают поисковый вектор при любой
+    записи строки (в том числе bulk_create и bulk_update), заполняет
+    векторы существующих строк и строит по ним GIN-индексы.
+    Только для PostgreSQL.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table, columns in SEARCH_TRIGGERS.items():
+        schema_editor.execute(
+            f"CREATE OR REPLACE FUNCTION {table}_search_vector() "
+            f"RETURNS trigger AS $$ BEGIN "
+            f"NEW.search_vector := {_vector_sql(columns, 'NEW.')}; "
+            f"RETURN NEW; END $$ LANGUAGE plpgsql"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {table}_search_vector_trg "
+            f"BEFORE INSERT OR UPDATE ON {table} FOR EACH ROW "
+            f"EXECUTE FUNCTION {table}_search_vector()"
+        )
+        schema_editor.execute(
+            f"UPDATE {table} SET search_vector = {_vector_sql(columns, '')}"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_INDEXES[table]} "
+            f"ON {table} USING gin (search_vector)"
+        )
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for table in SEARCH_TRIGGERS:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {SEARCH_INDEXES[table]}")
+        schema_editor.execute(
+            f"DROP TRIGGER IF EXISTS {table}_search_vector_trg ON {table}"
+        )
+        schema_editor.execute(
+            f"DROP FUNCTION IF EXISTS {table}_search_vector()"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("network", "0006_catalogproduct"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="networkobject",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                help_text=(
+                    "Название, город и страна; ведётся триггером PostgreSQL."
+                ),
+                null=True,
+                verbose_name="Поисковый вектор",
+            ),
+        ),
+        migrations.AddField(
+            model_name="catalogproduct",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False,
+                help_text="Название и модель; ведётся триггером PostgreSQL.",
+                null=True,
+                verbose_name="Поисковый вектор",
+            ),
+        ),
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
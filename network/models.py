@@ -1,12 +1,25 @@
 from decimal import Decimal
 
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat, Substr
+
+from .validators import validate_supplier_chain
 
 
 class NetworkObject(models.Model):
     """Описывает звено сети."""
 
+    class Level(models.IntegerChoices):
+        FACTORY = 0, "Завод"
+        RETAIL_NETWORK = 1, "Розничная сеть"
+        ENTREPRENEUR = 2, "Индивидуальный предприниматель"
+
+    PATH_SEPARATOR = "/"
+
     name = models.CharField(max_length=255, verbose_name="Наименование")
     email = models.EmailField(blank=True, verbose_name="Электронная почта")
     country = models.CharField(max_length=100, verbose_name="Страна")
@@ -31,45 +44,122 @@ class NetworkObject(models.Model):
         auto_now_add=True,
         verbose_name="Время создания"
     )
+    level = models.PositiveSmallIntegerField(
+        choices=Level.choices,
+        default=Level.FACTORY,
+        editable=False,
+        verbose_name="Уровень иерархии",
+    )
+    root_factory = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        editable=False,
+        verbose_name="Завод во главе цепочки",
+    )
+    path = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Цепочка поставщиков",
+        help_text="Идентификаторы поставщиков от завода, например «1/5/».",
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Поисковый вектор",
+        help_text="Название, город и страна; ведётся триггером PostgreSQL.",
+    )
+    assortment = models.ManyToManyField(
+        "CatalogProduct",
+        through="Product",
+        related_name="network_objects",
+        blank=True,
+        verbose_name="Ассортимент",
+    )
 
     class Meta:
         verbose_name = "Звено сети"
         verbose_name_plural = "Звенья сети"
+        indexes = [
+            models.Index(
+                fields=["-created_at", "-id"], name="network_obj_created_idx"
+            ),
+            models.Index(
+                fields=["country", "-created_at", "-id"],
+                name="network_obj_country_idx",
+            ),
+            models.Index(
+                fields=["city", "-created_at"], name="network_obj_city_idx"
+            ),
+            models.Index(fields=["name"], name="network_obj_name_idx"),
+            models.Index(
+                fields=["path"],
+                opclasses=["varchar_pattern_ops"],
+                name="network_obj_path_idx",
+            ),
+            models.Index(
+                fields=["debt_to_supplier"],
+                condition=Q(debt_to_supplier__gt=Decimal("0.00")),
+                name="network_obj_debt_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name}({self.get_level_display()})"
 
     @property
-    def level(self):
+    def ancestor_ids(self):
+        """Возвращает идентификаторы поставщиков от завода до звена."""
+        return [int(pk) for pk in self.path.split(self.PATH_SEPARATOR) if pk]
+
+    @property
+    def subtree_path(self):
+        """Префикс цепочки поставщиков для всех подчинённых звеньев."""
+        return f"{self.path}{self.pk}{self.PATH_SEPARATOR}"
+
+    def get_descendants(self):
+        """Возвращает все подчинённые звенья на любой глубине."""
+        return NetworkObject.objects.filter(
+            path__startswith=self.subtree_path
+        )
+
+    def materialize_hierarchy(self, supplier=None):
         """
-        Вычисляет уровень иерархии объекта.
+        Пересчитывает уровень, завод во главе цепочки и цепочку поставщиков
+        по данным поставщика (по умолчанию — закешированного self.supplier).
         """
-        distance = 0
-        node = self.supplier
-        visiting = set()
-        while node is not None:
-            visiting.add(node.pk)
-            distance += 1
-            if distance > 2:
-                return -2
-            node = node.supplier
-        return distance
-
-    def get_level_display(self):
-        """Отображает уровень иерархии в виде строки."""
-        lvl = self.level
-        if lvl is None:
-            return "Обнаружена проблема в цепочке поставщиков"
-        if lvl == -1:
-            return "Обнаружена циклическая связь"
-        if lvl == -2:
-            return "цепочка поставщиков превышает 3 звена"
-        if lvl == 0:
-            return "Завод"
-        elif lvl == 1:
-            return "Розничная сеть"
+        if supplier is None:
+            supplier = self.supplier
+        if supplier is None:
+            self.level = self.Level.FACTORY
+            self.root_factory = None
+            self.path = ""
         else:
-            return "Индивидуальный предприниматель"
+            self.level = supplier.level + 1
+            self.root_factory_id = supplier.root_factory_id or supplier.pk
+            self.path = supplier.subtree_path
+
+    @classmethod
+    def rebase_subtree(cls, old_prefix, new_prefix, level_delta, root_id):
+        """
+        Переносит все звенья с цепочкой, начинающейся с old_prefix,
+        под new_prefix одним запросом UPDATE.
+        """
+        if old_prefix == new_prefix and not level_delta:
+            return 0
+        return cls.objects.filter(path__startswith=old_prefix).update(
+            path=Concat(
+                Value(new_prefix),
+                Substr("path", len(old_prefix) + 1),
+                output_field=models.CharField(),
+            ),
+            level=F("level") + level_delta,
+            root_factory_id=root_id,
+        )
 
     def clean(self):
         """
@@ -79,37 +169,122 @@ class NetworkObject(models.Model):
             raise ValidationError(
                 {"debt_to_supplier": "Долг не может быть отрицательным."}
             )
-        if self.supplier and self.supplier.pk == self.pk:
-            raise ValidationError(
-                "Объект не может быть своим собственным поставщиком."
-            )
-        if self.supplier:
-            current_node = self.supplier
-            distance = 0
-            while current_node is not None:
-                if current_node.pk == self.pk:
-                    raise ValidationError("Обнаружена циклическая связь.")
-                distance += 1
-                if distance > 2:
-                    raise ValidationError(
-                        """
-                        Цепочка поставщиков не может содержать более 3 звеньев.
-                        """
-                    )
-                current_node = current_node.supplier
+        validate_supplier_chain(self)
+
+    def _stored_supplier(self):
+        """
+        Поставщик со значениями иерархии из строки, прочитанной при
+        проверке цепочки в этой транзакции: закешированный объект
+        поставщика мог устареть после переноса его поддерева.
+        """
+        row = self.__dict__.pop("_supplier_row", None)
+        if row is None or row["pk"] != self.supplier_id:
+            return None
+        return NetworkObject(
+            pk=row["pk"],
+            path=row["path"],
+            level=row["level"],
+            root_factory_id=row["root_factory_id"],
+        )
 
     def save(self, *args, **kwargs):
         with transaction.atomic():
             self.full_clean()
+            stored = None
+            if self.pk is not None:
+                stored = (
+                    NetworkObject.objects.filter(pk=self.pk)
+                    .values("path", "level", "debt_to_supplier")
+                    .first()
+                )
+            self._stored_state = stored
+            self.materialize_hierarchy(self._stored_supplier())
+            if stored is not None:
+                old_prefix = (
+                    f"{stored['path']}{self.pk}{self.PATH_SEPARATOR}"
+                )
+                if old_prefix != self.subtree_path:
+                    self.rebase_subtree(
+                        old_prefix,
+                        self.subtree_path,
+                        self.level - stored["level"],
+                        self.root_factory_id or self.pk,
+                    )
+                update_fields = kwargs.get("update_fields")
+                if update_fields is not None and (
+                    stored["path"] != self.path
+                    or stored["level"] != self.level
+                ):
+                    kwargs["update_fields"] = {
+                        *update_fields,
+                        "level",
+                        "path",
+                        "root_factory",
+                    }
             super().save(*args, **kwargs)
 
 
-class Product(models.Model):
-    """Описывает продукт."""
+class CatalogProduct(models.Model):
+    """Описывает модель продукта в каталоге: одна строка на модель."""
 
     name = models.CharField(max_length=255, verbose_name="Название продукта")
     model = models.CharField(max_length=255, verbose_name="Модель продукта")
     release_date = models.DateField(verbose_name="Дата выхода на рынок")
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name="Поисковый вектор",
+        help_text="Название и модель; ведётся триггером PostgreSQL.",
+    )
+
+    class Meta:
+        verbose_name = "Продукт каталога"
+        verbose_name_plural = "Каталог продуктов"
+        ordering = ("name", "model")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name", "model", "release_date"],
+                name="network_catalog_unique_product",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["model"], name="network_catalog_model_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.model})"
+
+
+def catalog_field(field):
+    """Поле модели каталога, доступное через связь ассортимента."""
+
+    def getter(product):
+        return product._get_catalog_field(field)
+
+    def setter(product, value):
+        product._set_catalog_field(field, value)
+
+    return property(getter, setter)
+
+
+class Product(models.Model):
+    """
+    Описывает продукт в ассортименте звена сети: связь звена с моделью
+    из каталога.
+
+    Поля name, model и release_date читаются из каталога. Их можно
+    передать и в конструктор: при сохранении связь указывает на модель
+    каталога с этими значениями, которая создаётся при необходимости.
+    """
+
+    CATALOG_FIELDS = ("name", "model", "release_date")
+
+    catalog_product = models.ForeignKey(
+        CatalogProduct,
+        on_delete=models.PROTECT,
+        related_name="assortment",
+        verbose_name="Продукт каталога",
+    )
     network_object = models.ForeignKey(
         NetworkObject,
         on_delete=models.CASCADE,
@@ -118,8 +293,142 @@ class Product(models.Model):
     )
 
     class Meta:
-        verbose_name: "Продукт"  # noqa: F821
+        verbose_name = "Продукт"
         verbose_name_plural = "Продукты"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["network_object", "catalog_product"],
+                name="network_product_unique_assortment",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.model})"
+
+    def _get_catalog_field(self, field):
+        pending = self.__dict__.get("_catalog_fields", {})
+        if field in pending:
+            return pending[field]
+        if self.catalog_product_id is None:
+            return None
+        return getattr(self.catalog_product, field)
+
+    def _set_catalog_field(self, field, value):
+        self.__dict__.setdefault("_catalog_fields", {})[field] = value
+
+    name = catalog_field("name")
+    model = catalog_field("model")
+    release_date = catalog_field("release_date")
+
+    def resolve_catalog_product(self):
+        """
+        Привязывает связь к модели каталога по значениям, переданным
+        через name, model и release_date.
+        """
+        pending = self.__dict__.pop("_catalog_fields", None)
+        if not pending:
+            return
+        values = {
+            field: self._get_catalog_field(field)
+            for field in self.CATALOG_FIELDS
+        }
+        values.update(pending)
+        self.catalog_product, _ = CatalogProduct.objects.get_or_create(
+            **values
+        )
+
+    def _stored_supplier(self):
+        """
+        Поставщик со значениями иерархии из строки, прочитанной при
+        проверке цепочки в этой транзакции: закешированный объект
+        поставщика мог устареть после переноса его поддерева.
+        """
+        row = self.__dict__.pop("_supplier_row", None)
+        if row is None or row["pk"] != self.supplier_id:
+            return None
+        return NetworkObject(
+            pk=row["pk"],
+            path=row["path"],
+            level=row["level"],
+            root_factory_id=row["root_factory_id"],
+        )
+
+    def save(self, *args, **kwargs):
+        self.resolve_catalog_product()
+        super().save(*args, **kwargs)
+
+
+class DebtClearance(models.Model):
+    """Описывает запись журнала очистки задолженности перед поставщиком."""
+
+    cleared_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="debt_clearances",
+        verbose_name="Пользователь",
+    )
+    objects_count = models.PositiveIntegerField(
+        verbose_name="Количество звеньев"
+    )
+    total_amount = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        verbose_name="Сумма очищенной задолженности",
+    )
+    filters = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Условия отбора",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Время очистки"
+    )
+
+    class Meta:
+        verbose_name = "Очистка задолженности"
+        verbose_name_plural = "Журнал очистки задолженности"
+        ordering = ("-created_at",)
+
+    def __str__(self):
+        return f"{self.created_at:%d.%m.%Y %H:%M}: {self.total_amount}"
+
+
+class DebtRollup(models.Model):
+    """
+    Описывает сводную задолженность перед звеном: прямых подчинённых
+    и всего дерева под ним.
+    """
+
+    network_object = models.OneToOneField(
+        NetworkObject,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="debt_rollup",
+        verbose_name="Звено сети",
+    )
+    direct_debt = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Долг прямых подчинённых",
+    )
+    total_debt = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Долг всего дерева",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Время пересчёта"
+    )
+
+    class Meta:
+        verbose_name = "Сводная задолженность"
+        verbose_name_plural = "Сводная задолженность"
+
+    def __str__(self):
+        return f"{self.network_object_id}: {self.total_debt}"
@@ -0,0 +1,89 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+from .search import SearchRankOrderingMixin
+
+
+class NetworkObjectCursorPagination(SearchRankOrderingMixin,
+                                    CursorPagination):
+    """
+    Постраничный вывод по ключу (created_at, id): стоимость страницы
+    не зависит от её номера и размера таблицы. При поиске — по
+    релевантности. Сортировка из ?ordering= дополняется id, чтобы
+    порядок строк с равным ключом был однозначным.
+    """
+
+    page_size = settings.NETWORK_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.NETWORK_MAX_PAGE_SIZE
+    ordering = ("-created_at", "-id")
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if not {"id", "-id"} & set(ordering):
+            ordering += ("-id",)
+        return ordering
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Асинхронный вариант paginate_queryset: страница выбирается
+        через асинхронный ORM, состояние курсора заполняется так же,
+        как в синхронном варианте, для get_paginated_response.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            order = self.ordering[0]
+            order_attr = order.lstrip("-")
+            if self.cursor.reverse != order.startswith("-"):
+                lookup = f"{order_attr}__lt"
+            else:
+                lookup = f"{order_attr}__gt"
+            queryset = queryset.filter(**{lookup: current_position})
+        results = [
+            obj async for obj in queryset[offset:offset + self.page_size + 1]
+        ]
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+        following_position = None
+        if has_following:
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        has_current = current_position is not None or offset > 0
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = has_current, has_following
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next, self.has_previous = has_following, has_current
+            self.next_position = following_position
+            self.previous_position = current_position
+        return self.page
+
+
+class ProductCursorPagination(SearchRankOrderingMixin, CursorPagination):
+    """
+    Постраничный вывод продуктов по ключу id, при поиске — по
+    релевантности.
+    """
+
+    page_size = settings.NETWORK_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.NETWORK_MAX_PAGE_SIZE
+    ordering = ("-id",)
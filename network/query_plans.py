@@ -0,0 +1,144 @@
+from functools import partial
+
+from django.contrib.admin import site
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from .filters import NetworkObjectFilter
+from .models import NetworkObject, Product
+from .services import with_debt
+from .views import NetworkObjectViewSet
+
+NETWORK_TABLES = (
+    "network_networkobject",
+    "network_catalogproduct",
+    "network_product",
+)
+
+
+def _request(params):
+    """GET-запрос суперпользователя с параметрами params."""
+    request = RequestFactory().get("/", params)
+    request.user = get_user_model()(
+        is_active=True, is_staff=True, is_superuser=True
+    )
+    return request
+
+
+def _api_list(params):
+    """Страница списка API звеньев, как её выбирает NetworkObjectViewSet."""
+    django_request = _request(params)
+    request = Request(django_request)
+    request.user = django_request.user
+    view = NetworkObjectViewSet(
+        action="list", request=request, format_kwarg=None, args=(), kwargs={}
+    )
+    queryset = view.filter_queryset(view.get_queryset())
+    paginator = view.paginator
+    ordering = paginator.get_ordering(request, queryset, view)
+    return queryset.order_by(*ordering)[:paginator.get_page_size(request)]
+
+
+def _admin_list(model, params):
+    """Страница списка админки модели, как её выбирает ChangeList."""
+    changelist = site._registry[model].get_changelist_instance(
+        _request(params)
+    )
+    return changelist.queryset[:changelist.list_per_page]
+
+
+def _debt_to_clear(params):
+    """Звенья, которые очищает API clear_debt по фильтрам params."""
+    filterset = NetworkObjectFilter(
+        params, queryset=NetworkObject.objects.all()
+    )
+    return with_debt(filterset.qs)
+
+
+# Горячий запрос: (построитель, параметры, индекс по СУБД). Запрос
+# строится тем же кодом, что и в API и админке. Для СУБД, которой нет
+# в словаре индексов, подходящего индекса нет (поиск подстроки в SQLite).
+HOT_QUERIES = {
+    "api_list": (
+        _api_list,
+        {},
+        {
+            "postgresql": "network_obj_created_idx",
+            "sqlite": "network_obj_created_idx",
+        },
+    ),
+    "api_list_by_country": (
+        _api_list,
+        {"country": "Беларусь"},
+        {
+            "postgresql": "network_obj_country_idx",
+            "sqlite": "network_obj_country_idx",
+        },
+    ),
+    "admin_list_by_city": (
+        partial(_admin_list, NetworkObject),
+        {"city__exact": "Минск"},
+        {
+            "postgresql": "network_obj_city_idx",
+            "sqlite": "network_obj_city_idx",
+        },
+    ),
+    "product_admin_by_network_object_name": (
+        partial(_admin_list, Product),
+        {"network_object__name__exact": "Завод 1"},
+        {
+            "postgresql": "network_obj_name_idx",
+            "sqlite": "network_obj_name_idx",
+        },
+    ),
+    "product_admin_search": (
+        partial(_admin_list, Product),
+        {"q": "Продукт 1"},
+        {"postgresql": "network_catalog_search_idx"},
+    ),
+    "debt_to_clear": (
+        _debt_to_clear,
+        {"city": "Минск"},
+        {
+            "postgresql": "network_obj_city_idx",
+            "sqlite": "network_obj_city_idx",
+        },
+    ),
+}
+
+
+def analyze_tables():
+    """Обновляет статистику планировщика по таблицам сети."""
+    with connection.cursor() as cursor:
+        for table in NETWORK_TABLES:
+            cursor.execute(f"ANALYZE {table}")
+
+
+def hot_query_plans():
+    """
+    Возвращает словарь {имя запроса: (ожидаемый индекс, план)}.
+    Ожидаемый индекс равен None, если в текущей СУБД его нет.
+    """
+    plans = {}
+    for name, (build, params, indexes) in HOT_QUERIES.items():
+        plans[name] = (
+            indexes.get(connection.vendor),
+            build(params).explain(),
+        )
+    return plans
+
+
+def find_missing_indexes():
+    """
+    Возвращает словарь {имя запроса: (ожидаемый индекс, план)} для
+    запросов, план которых не использует ожидаемый индекс. Планы
+    зависят от статистики: проверка имеет смысл на данных реального
+    размера после analyze_tables().
+    """
+    return {
+        name: (index, plan)
+        for name, (index, plan) in hot_query_plans().items()
+        if index is not None and index not in plan
+    }
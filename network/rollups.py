@@ -0,0 +1,131 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import DebtRollup, NetworkObject
+
+ZERO = Decimal("0.00")
+
+
+def _sum_by(field, ids=None):
+    queryset = NetworkObject.objects.filter(**{f"{field}__isnull": False})
+    if ids is not None:
+        queryset = queryset.filter(**{f"{field}__in": ids})
+    return dict(
+        queryset.order_by()
+        .values_list(field)
+        .annotate(total=Sum("debt_to_supplier"))
+    )
+
+
+def compute_debt_rollups(ids=None):
+    """
+    Считает в SQL задолженность перед звеньями группировкой по поставщику
+    и по заводу во главе цепочки.
+
+    Для завода долг всего дерева — сумма по root_factory, для звена
+    первого уровня — долг его прямых подчинённых: глубина цепочки
+    ограничена тремя звеньями. Возвращает словарь
+    {id звена: (долг прямых подчинённых, долг всего дерева)}.
+    """
+    direct = _sum_by("supplier_id", ids)
+    by_factory = _sum_by("root_factory_id", ids)
+    if ids is None:
+        nodes = NetworkObject.objects.filter(
+            level__lt=NetworkObject.Level.ENTREPRENEUR
+        )
+    else:
+        nodes = NetworkObject.objects.filter(pk__in=ids)
+    levels = {
+        pk: level
+        for pk, level in nodes.values_list("pk", "level").iterator()
+        if ids is not None or pk in direct or pk in by_factory
+    }
+    rollups = {}
+    for pk, level in levels.items():
+        direct_debt = direct.get(pk) or ZERO
+        if level == NetworkObject.Level.FACTORY:
+            total_debt = by_factory.get(pk) or ZERO
+        else:
+            total_debt = direct_debt
+        rollups[pk] = (direct_debt, total_debt)
+    return rollups
+
+
+def rollups_enabled():
+    return settings.NETWORK_DEBT_ROLLUPS_ENABLED
+
+
+def refresh_debt_rollups(ids):
+    """
+    Пересчитывает строки сводной таблицы только для переданных звеньев.
+    """
+    ids = {pk for pk in ids if pk is not None}
+    if not ids or not rollups_enabled():
+        return
+    rollups = compute_debt_rollups(ids)
+    with transaction.atomic():
+        DebtRollup.objects.filter(pk__in=ids - set(rollups)).delete()
+        DebtRollup.objects.bulk_create(
+            [
+                DebtRollup(
+                    network_object_id=pk,
+                    direct_debt=direct_debt,
+                    total_debt=total_debt,
+                )
+                for pk, (direct_debt, total_debt) in rollups.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["network_object"],
+            update_fields=["direct_debt", "total_debt", "updated_at"],
+        )
+
+
+def rebuild_debt_rollups():
+    """Полностью перестраивает сводную таблицу задолженности."""
+    rollups = compute_debt_rollups()
+    with transaction.atomic():
+        DebtRollup.objects.all().delete()
+        DebtRollup.objects.bulk_create(
+            [
+                DebtRollup(
+                    network_object_id=pk,
+                    direct_debt=direct_debt,
+                    total_debt=total_debt,
+                )
+                for pk, (direct_debt, total_debt) in rollups.items()
+            ],
+            batch_size=settings.NETWORK_BULK_BATCH_SIZE,
+        )
+    return len(rollups)
+
+
+def get_debt_rollups(level=None):
+    """
+    Возвращает сводную задолженность звеньев, имеющих подчинённых:
+    из сводной таблицы, если она ведётся, иначе — расчётом в SQL.
+    """
+    if rollups_enabled():
+        queryset = DebtRollup.objects.select_related("network_object")
+        if level is not None:
+            queryset = queryset.filter(network_object__level=level)
+        return list(queryset.order_by("-total_debt", "network_object_id"))
+    rollups = compute_debt_rollups()
+    nodes = NetworkObject.objects.filter(
+        level__lt=NetworkObject.Level.ENTREPRENEUR
+    )
+    if level is not None:
+        nodes = nodes.filter(level=level)
+    result = [
+        DebtRollup(
+            network_object=node,
+            direct_debt=rollups[node.pk][0],
+            total_debt=rollups[node.pk][1],
+        )
+        for node in nodes.only("pk", "name", "level").iterator()
+        if node.pk in rollups
+    ]
+    result.sort(key=lambda rollup: (-rollup.total_debt, rollup.pk))
+    return result
@@ -0,0 +1,120 @@
+import re
+
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Coalesce
+from rest_framework.filters import BaseFilterBackend
+
+SEARCH_RANK = "search_rank"
+SEARCH_PARAM = "search"
+# Должна совпадать с конфигурацией триггеров поисковых векторов
+# (миграция 0007); меняется вместе с новой миграцией, которая
+# пересоздаёт триггеры и пересчитывает векторы.
+SEARCH_CONFIG = "russian"
+
+
+def _prefix_tsquery(text):
+    """
+    Строит tsquery, в котором каждое слово ищется как префикс:
+    «моск заво» найдёт «Московский завод».
+    """
+    return " & ".join(f"{word}:*" for word in re.findall(r"\w+", text))
+
+
+def full_text_search(queryset, text, vector, fields):
+    """
+    Отбирает строки по поисковому запросу и добавляет аннотацию
+    search_rank для сортировки по релевантности.
+
+    В PostgreSQL строка подходит, если поисковый вектор совпадает
+    с запросом (слова с учётом морфологии и префикса) или одно из полей
+    содержит запрос как подстроку: по вектору ищет GIN-индекс, по
+    подстроке — триграммные индексы. В других СУБД выполняется только
+    поиск подстроки, search_rank равен нулю.
+    """
+    text = text.strip()
+    if not text:
+        return queryset
+    substring = Q()
+    for field in fields:
+        substring |= Q(**{f"{field}__icontains": text})
+    tsquery = _prefix_tsquery(text)
+    if connections[queryset.db].vendor != "postgresql" or not tsquery:
+        return queryset.filter(substring).annotate(
+            **{SEARCH_RANK: Value(0.0, output_field=FloatField())}
+        )
+    query = SearchQuery(tsquery, config=SEARCH_CONFIG, search_type="raw")
+    return queryset.filter(Q(**{vector: query}) | substring).annotate(
+        **{
+            SEARCH_RANK: Coalesce(
+                SearchRank(F(vector), query),
+                Value(0.0),
+                output_field=FloatField(),
+            )
+        }
+    )
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Поиск по параметру ?search= с ранжированием. Представление задаёт
+    путь к поисковому вектору (search_vector) и поля для поиска
+    подстроки (search_fields).
+    """
+
+    search_param = SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "")
+        return full_text_search(
+            queryset, text, view.search_vector, view.search_fields
+        )
+
+
+class SearchRankOrderingMixin:
+    """
+    Для пагинации по ключу: при поиске без явной сортировки страницы
+    упорядочены по релевантности, затем по id.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if SEARCH_RANK in queryset.query.annotations and tuple(
+            ordering
+        ) == tuple(self.ordering):
+            return (f"-{SEARCH_RANK}", "-id")
+        return ordering
+
+
+class SearchRankChangeList(ChangeList):
+    """
+    Список админки, который при поиске без выбранной пользователем
+    сортировки упорядочен по релевантности.
+    """
+
+    def get_ordering(self, request, queryset):
+        if (
+            SEARCH_RANK in queryset.query.annotations
+            and ORDER_VAR not in self.params
+        ):
+            return [f"-{SEARCH_RANK}", "-pk"]
+        return super().get_ordering(request, queryset)
+
+
+class FullTextSearchAdminMixin:
+    """Поиск в админке через full_text_search."""
+
+    search_vector = "search_vector"
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        queryset = full_text_search(
+            queryset, search_term, self.search_vector, self.search_fields
+        )
+        return queryset, False
+
+    def get_changelist(self, request, **kwargs):
+        return SearchRankChangeList
@@ -0,0 +1,125 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from .cache import invalidate_network_cache
+from .models import CatalogProduct, NetworkObject, Product
+from .rollups import rebuild_debt_rollups, rollups_enabled
+
+CITIES = (
+    ("Россия", "Москва"),
+    ("Россия", "Санкт-Петербург"),
+    ("Россия", "Казань"),
+    ("Беларусь", "Минск"),
+    ("Казахстан", "Алматы"),
+)
+LEVEL_PREFIXES = {
+    NetworkObject.Level.FACTORY: "Завод",
+    NetworkObject.Level.RETAIL_NETWORK: "Сеть",
+    NetworkObject.Level.ENTREPRENEUR: "ИП",
+}
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _seed_catalog(count, batch_size):
+    rows = [
+        CatalogProduct(
+            name=f"Продукт {number}",
+            model=f"M-{number}",
+            release_date=date(2020, 1, 1) + timedelta(days=number),
+        )
+        for number in range(1, count + 1)
+    ]
+    CatalogProduct.objects.bulk_create(
+        rows, batch_size=batch_size, ignore_conflicts=True
+    )
+    return list(
+        CatalogProduct.objects.filter(
+            model__in=[row.model for row in rows]
+        ).values_list("pk", flat=True)
+    )
+
+
+def _build_node(rng, supplier, label):
+    level = 0 if supplier is None else supplier.level + 1
+    country, city = rng.choice(CITIES)
+    node = NetworkObject(
+        name=f"{LEVEL_PREFIXES[level]} {label}",
+        email=f"node-{label}@example.com",
+        country=country,
+        city=city,
+        street="Тестовая",
+        house_number=str(rng.randint(1, 999)),
+        supplier=supplier,
+        debt_to_supplier=(
+            Decimal("0.00")
+            if supplier is None
+            else Decimal(rng.randint(0, 10_000_000)) / 100
+        ),
+    )
+    node.materialize_hierarchy()
+    return node
+
+
+def seed_network(factories, fan_out, products, batch_size=None, seed=0):
+    """
+    Создаёт тестовую сеть: factories заводов, у каждого звена уровней
+    0 и 1 — fan_out подчинённых, у каждого звена — products продуктов
+    из общего каталога.
+
+    Запись выполняется bulk_create порциями по уровням иерархии, уровень
+    и цепочка поставщиков вычисляются в памяти. Повторный запуск
+    добавляет новые звенья к существующим. Возвращает число созданных
+    звеньев, моделей каталога и строк ассортимента.
+    """
+    batch_size = batch_size or settings.NETWORK_BULK_BATCH_SIZE
+    rng = random.Random(seed)
+    with transaction.atomic():
+        catalog_ids = _seed_catalog(products, batch_size)
+        layer = [
+            _build_node(rng, None, f"{number}")
+            for number in range(1, factories + 1)
+        ]
+        NetworkObject.objects.bulk_create(layer, batch_size=batch_size)
+        nodes = list(layer)
+        while layer and layer[0].level < NetworkObject.Level.ENTREPRENEUR:
+            parents, layer = layer, []
+            for chunk in _chunks(
+                (
+                    _build_node(rng, parent, f"{parent.pk}-{number}")
+                    for parent in parents
+                    for number in range(1, fan_out + 1)
+                ),
+                batch_size,
+            ):
+                NetworkObject.objects.bulk_create(chunk)
+                layer.extend(chunk)
+            nodes.extend(layer)
+        assortment = 0
+        for chunk in _chunks(
+            (
+                Product(network_object_id=node.pk, catalog_product_id=pk)
+                for node in nodes
+                for pk in catalog_ids
+            ),
+            batch_size,
+        ):
+            Product.objects.bulk_create(chunk)
+            assortment += len(chunk)
+        if rollups_enabled():
+            rebuild_debt_rollups()
+        invalidate_network_cache()
+    return {
+        "network_objects": len(nodes),
+        "catalog_products": len(catalog_ids),
+        "products": assortment,
+    }
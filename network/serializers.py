@@ -1,10 +1,192 @@
 from rest_framework import serializers
 
-from .models import NetworkObject
+from config.metrics import TimedSerializerMixin
 
+from .models import DebtRollup, NetworkObject, Product
+from .validators import check_supplier_chains
 
-class NetworkObjectSerializer(serializers.ModelSerializer):
+
+class SparseFieldsetMixin:
+    """Оставляет в ответе только поля, перечисленные в параметре ?fields=."""
+
+    fields_query_param = "fields"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        requested = self.get_requested_fields(request)
+        if requested:
+            for name in set(self.fields) - requested:
+                self.fields.pop(name)
+
+    @classmethod
+    def get_requested_fields(cls, request):
+        """Возвращает множество запрошенных полей или None."""
+        if request is None or request.method != "GET":
+            return None
+        value = request.query_params.get(cls.fields_query_param)
+        if not value:
+            return None
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+    @classmethod
+    def get_only_fields(cls, request):
+        """
+        Возвращает поля модели для QuerySet.only() по запрошенным полям
+        сериализатора или None, если загружать нужно все поля.
+        """
+        requested = cls.get_requested_fields(request)
+        if not requested:
+            return None
+        model = cls.Meta.model
+        concrete = {field.name for field in model._meta.concrete_fields}
+        return {name for name in requested if name in concrete}
+
+
+class NetworkObjectSerializer(TimedSerializerMixin, SparseFieldsetMixin,
+                              serializers.ModelSerializer):
     class Meta:
         model = NetworkObject
-        fields = "__all__"
+        exclude = ["assortment", "search_vector"]
         read_only_fields = ["debt_to_supplier"]
+
+    def validate(self, attrs):
+        """Проверяет цепочку поставщиков до сохранения объекта."""
+        attrs = super().validate(attrs)
+        if self.instance is not None and "supplier" not in attrs:
+            return attrs
+        candidate = NetworkObject(
+            pk=getattr(self.instance, "pk", None),
+            supplier=attrs.get("supplier"),
+        )
+        errors = check_supplier_chains([candidate])
+        if errors:
+            raise serializers.ValidationError(
+                {"supplier": errors[0].messages}
+            )
+        return attrs
+
+
+class NetworkObjectBulkSerializer(serializers.ModelSerializer):
+    """
+    Проверяет строку пакетной загрузки без запросов к БД: поставщик
+    передаётся идентификатором и проверяется вместе со всей пачкой.
+    """
+
+    id = serializers.IntegerField(required=False)
+    ref = serializers.CharField(required=False, max_length=64)
+    supplier = serializers.IntegerField(required=False, allow_null=True)
+    supplier_ref = serializers.CharField(required=False, max_length=64)
+
+    class Meta:
+        model = NetworkObject
+        fields = [
+            "id",
+            "ref",
+            "name",
+            "email",
+            "country",
+            "city",
+            "street",
+            "house_number",
+            "supplier",
+            "supplier_ref",
+        ]
+
+    @classmethod
+    def writable_model_fields(cls):
+        """Возвращает поля модели, которые можно изменить пачкой."""
+        return [
+            field
+            for field in cls.Meta.fields
+            if field not in ("id", "ref", "supplier_ref")
+        ]
+
+
+class ProductTreeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    name = serializers.CharField(source="catalog_product.name")
+    model = serializers.CharField(source="catalog_product.model")
+    release_date = serializers.DateField(
+        source="catalog_product.release_date"
+    )
+
+    class Meta:
+        model = Product
+        fields = ["id", "name", "model", "release_date", "network_object",
+                  "catalog_product"]
+
+
+class ProductSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Продукт в ассортименте звена. Название, модель и дата выхода
+    хранятся в каталоге: при записи связь указывает на модель каталога
+    с этими значениями.
+    """
+
+    name = serializers.CharField(max_length=255)
+    model = serializers.CharField(max_length=255)
+    release_date = serializers.DateField()
+    network_object_name = serializers.CharField(
+        source="network_object.name", read_only=True
+    )
+
+    class Meta:
+        model = Product
+        fields = ["id", "name", "model", "release_date", "catalog_product",
+                  "network_object", "network_object_name"]
+        read_only_fields = ["catalog_product"]
+
+    def validate(self, attrs):
+        """
+        Проверяет, что продукта ещё нет у звена и что звено, имеющее
+        поставщика, берёт продукт из ассортимента поставщика.
+        """
+        attrs = super().validate(attrs)
+        values = {
+            field: attrs.get(field, getattr(self.instance, field, None))
+            for field in Product.CATALOG_FIELDS
+        }
+        network_object = attrs.get(
+            "network_object", getattr(self.instance, "network_object", None)
+        )
+        lookup = {
+            f"catalog_product__{field}": value
+            for field, value in values.items()
+        }
+        duplicates = Product.objects.filter(
+            network_object=network_object, **lookup
+        )
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError(
+                "Этот продукт уже есть у звена."
+            )
+        if network_object.supplier_id is not None and not (
+            Product.objects.filter(
+                network_object_id=network_object.supplier_id, **lookup
+            ).exists()
+        ):
+            raise serializers.ValidationError(
+                "Звено может продавать только продукты своего поставщика."
+            )
+        return attrs
+
+
+class ProductPropagationSerializer(serializers.Serializer):
+    products = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+    subordinates = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+
+
+class DebtRollupSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    name = serializers.CharField(source="network_object.name")
+    level = serializers.IntegerField(source="network_object.level")
+
+    class Meta:
+        model = DebtRollup
+        fields = ["network_object", "name", "level", "direct_debt",
+                  "total_debt"]
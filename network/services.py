@@ -0,0 +1,369 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from .cache import invalidate_network_cache
+from .models import DebtClearance, NetworkObject, Product
+from .rollups import refresh_debt_rollups
+from .serializers import NetworkObjectBulkSerializer, ProductTreeSerializer
+from .validators import resolve_supplier_chains
+
+HIERARCHY_FIELDS = ["level", "root_factory", "path"]
+# Сколько id очищенных звеньев записывать в журнал; для больших
+# очисток записывается диапазон id.
+CLEARED_IDS_LIMIT = 1000
+
+
+def _row_errors(error):
+    return {"non_field_errors": error.messages}
+
+
+def bulk_save_network_objects(rows):
+    """
+    Создаёт и обновляет звенья сети пачкой.
+
+    Строка с полем id обновляет существующее звено, без него — создаёт
+    новое. Поставщиком может быть существующее звено (supplier) или строка
+    той же пачки, помеченная полем ref (supplier_ref). Проверка цепочек
+    выполняется для всей пачки за постоянное число запросов, запись —
+    через bulk_create/bulk_update порциями. Строки с ошибками пропускаются.
+
+    Возвращает словарь с числом созданных и обновлённых звеньев и списком
+    ошибок по индексам строк.
+    """
+    errors = {}
+    parsed = {}
+    creating = NetworkObjectBulkSerializer()
+    updating = NetworkObjectBulkSerializer(partial=True)
+    for index, row in enumerate(rows):
+        partial = isinstance(row, dict) and row.get("id") is not None
+        serializer = updating if partial else creating
+        try:
+            parsed[index] = serializer.run_validation(row)
+        except ValidationError as error:
+            errors[index] = error.detail
+
+    refs = {}
+    for index, data in parsed.items():
+        ref = data.get("ref")
+        if ref is None:
+            continue
+        if ref in refs:
+            errors[index] = {"ref": ["Повторяющееся значение ref."]}
+        else:
+            refs[ref] = index
+
+    lookup_ids = {data["id"] for data in parsed.values() if "id" in data}
+    lookup_ids.update(
+        data["supplier"] for data in parsed.values() if data.get("supplier")
+    )
+    stored = NetworkObject.objects.in_bulk(lookup_ids)
+
+    objects = {}
+    supplier_refs = {}
+    for index, data in parsed.items():
+        if index in errors:
+            continue
+        data = dict(data)
+        pk = data.pop("id", None)
+        data.pop("ref", None)
+        supplier_ref = data.pop("supplier_ref", None)
+        if supplier_ref is not None and "supplier" in data:
+            errors[index] = {
+                "supplier": ["Укажите supplier или supplier_ref, не оба."]
+            }
+            continue
+        if supplier_ref is not None and supplier_ref not in refs:
+            errors[index] = {
+                "supplier_ref": ["Строка с таким ref не найдена."]
+            }
+            continue
+        if "supplier" in data:
+            data["supplier_id"] = data.pop("supplier")
+        if pk is None:
+            obj = NetworkObject(**data)
+        elif pk in stored:
+            obj = stored[pk]
+            for field, value in data.items():
+                setattr(obj, field, value)
+        else:
+            errors[index] = {"id": ["Звено сети не найдено."]}
+            continue
+        objects[index] = obj
+        if supplier_ref is not None:
+            supplier_refs[index] = refs[supplier_ref]
+
+    pending = True
+    while pending:
+        pending = False
+        for index, supplier_index in list(supplier_refs.items()):
+            if index in objects and supplier_index not in objects:
+                errors[index] = {
+                    "supplier_ref": ["Строка поставщика содержит ошибки."]
+                }
+                del objects[index]
+                pending = True
+    for index, supplier_index in supplier_refs.items():
+        if index in objects:
+            objects[index].supplier = objects[supplier_index]
+
+    indexes = list(objects)
+    batch = [objects[index] for index in indexes]
+    levels, chain_errors = resolve_supplier_chains(batch)
+    for position, error in chain_errors.items():
+        errors[indexes[position]] = _row_errors(error)
+
+    by_pk = {obj.pk: obj for obj in batch if obj.pk is not None}
+    layers = {}
+    for position, level in levels.items():
+        layers.setdefault(level, []).append(batch[position])
+
+    created = updated = 0
+    affected_ids = set()
+    batch_size = settings.NETWORK_BULK_BATCH_SIZE
+    with transaction.atomic():
+        for level in sorted(layers):
+            new_objects = []
+            changed_objects = []
+            moved = []
+            for obj in layers[level]:
+                if not NetworkObject.supplier.is_cached(obj):
+                    supplier_id = obj.supplier_id
+                    obj.supplier = by_pk.get(supplier_id) or stored.get(
+                        supplier_id
+                    )
+                if obj.pk is None:
+                    obj.materialize_hierarchy()
+                    new_objects.append(obj)
+                    continue
+                old_prefix = obj.subtree_path
+                old_level = obj.level
+                affected_ids.update(obj.ancestor_ids)
+                obj.materialize_hierarchy()
+                if old_prefix != obj.subtree_path:
+                    moved.append((obj, old_prefix, old_level))
+                changed_objects.append(obj)
+            NetworkObject.objects.bulk_create(
+                new_objects, batch_size=batch_size
+            )
+            if changed_objects:
+                NetworkObject.objects.bulk_update(
+                    changed_objects,
+                    NetworkObjectBulkSerializer.writable_model_fields()
+                    + HIERARCHY_FIELDS,
+                    batch_size=batch_size,
+                )
+            for obj, old_prefix, old_level in moved:
+                level_delta = obj.level - old_level
+                NetworkObject.rebase_subtree(
+                    old_prefix,
+                    obj.subtree_path,
+                    level_delta,
+                    obj.root_factory_id or obj.pk,
+                )
+                # Звенья пачки и прочитанные поставщики вне её остаются
+                # в памяти: переносим их так же, как rebase_subtree.
+                for other in stored.values():
+                    if other.path.startswith(old_prefix):
+                        other.path = (
+                            obj.subtree_path + other.path[len(old_prefix):]
+                        )
+                        other.level += level_delta
+                        other.root_factory_id = obj.root_factory_id or obj.pk
+            created += len(new_objects)
+            updated += len(changed_objects)
+            for obj in new_objects + changed_objects:
+                affected_ids.update(obj.ancestor_ids)
+        refresh_debt_rollups(affected_ids)
+        invalidate_network_cache()
+    return {
+        "created": created,
+        "updated": updated,
+        "errors": [
+            {"index": index, "errors": errors[index]}
+            for index in sorted(errors)
+        ],
+    }
+
+
+def with_debt(queryset):
+    """Отбирает звенья с задолженностью перед поставщиком."""
+    return queryset.filter(debt_to_supplier__gt=Decimal("0.00"))
+
+
+def clear_debt(queryset, user=None, filters=None):
+    """
+    Обнуляет задолженность перед поставщиком одним запросом UPDATE
+    и записывает в журнал количество звеньев и очищенную сумму.
+
+    Строки с задолженностью сначала блокируются SELECT ... FOR UPDATE:
+    сумма в журнале считается по тем же значениям, которые обнуляются,
+    даже если звенья параллельно изменяются. К условиям отбора в журнале
+    добавляются id очищенных звеньев (cleared_ids), а если их больше
+    CLEARED_IDS_LIMIT — первый и последний id (cleared_id_range).
+
+    Возвращает запись журнала или None, если задолженности не было.
+    """
+    queryset = with_debt(queryset)
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update()
+            .order_by("pk")
+            .values_list(
+                "pk", "debt_to_supplier", "supplier_id", "root_factory_id"
+            )
+        )
+        if not rows:
+            return None
+        total = sum(debt for _, debt, _, _ in rows)
+        affected_ids = {
+            ancestor_id
+            for _, _, *ancestor_ids in rows
+            for ancestor_id in ancestor_ids
+            if ancestor_id is not None
+        }
+        cleared_ids = [pk for pk, _, _, _ in rows]
+        objects_count = NetworkObject.objects.filter(
+            pk__in=cleared_ids
+        ).update(debt_to_supplier=Decimal("0.00"))
+        filters = dict(filters or {})
+        if len(cleared_ids) <= CLEARED_IDS_LIMIT:
+            filters["cleared_ids"] = cleared_ids
+        else:
+            filters["cleared_id_range"] = [cleared_ids[0], cleared_ids[-1]]
+        refresh_debt_rollups(affected_ids)
+        invalidate_network_cache()
+        return DebtClearance.objects.create(
+            cleared_by_id=user.pk if user and user.is_authenticated else None,
+            objects_count=objects_count,
+            total_amount=total.quantize(Decimal("0.01")),
+            filters=filters,
+        )
+
+
+def _supplier_tree_querysets(root, depth=None):
+    nodes = NetworkObject.objects.defer("search_vector").filter(
+        Q(pk=root.pk) | Q(path__startswith=root.subtree_path)
+    )
+    if depth is not None:
+        nodes = nodes.filter(level__lte=root.level + depth)
+    products = (
+        Product.objects.filter(network_object__in=nodes.values("pk"))
+        .select_related("catalog_product")
+        .defer("catalog_product__search_vector")
+        .order_by("pk")
+    )
+    return nodes.order_by("level", "pk"), products
+
+
+def _assemble_supplier_tree(root, nodes, products, serializer_class,
+                            context):
+    data = serializer_class(nodes, many=True, context=context).data
+    by_id = {}
+    for node, item in zip(nodes, data):
+        item["subordinates"] = []
+        if products is not None:
+            item["products"] = []
+        by_id[node.pk] = item
+    if products is not None:
+        for product in ProductTreeSerializer(products, many=True).data:
+            by_id[product["network_object"]]["products"].append(product)
+    for node in nodes[1:]:
+        by_id[node.supplier_id]["subordinates"].append(by_id[node.pk])
+    return by_id[root.pk]
+
+
+def build_supplier_tree(root, serializer_class, context, depth=None,
+                        with_products=False):
+    """
+    Собирает вложенное дерево подчинённых звена по цепочке поставщиков:
+    одним запросом для звеньев и одним — для их продуктов.
+    """
+    nodes, products = _supplier_tree_querysets(root, depth)
+    return _assemble_supplier_tree(
+        root,
+        list(nodes),
+        list(products) if with_products else None,
+        serializer_class,
+        context,
+    )
+
+
+async def abuild_supplier_tree(root, serializer_class, context, depth=None,
+                               with_products=False):
+    """Асинхронный вариант build_supplier_tree на асинхронном ORM."""
+    nodes, products = _supplier_tree_querysets(root, depth)
+    nodes = [node async for node in nodes]
+    if with_products:
+        products = [product async for product in products]
+    else:
+        products = None
+    return _assemble_supplier_tree(
+        root, nodes, products, serializer_class, context
+    )
+
+
+def propagate_products(source, product_ids=None, target_ids=None):
+    """
+    Добавляет продукты звена в ассортимент его подчинённых вниз
+    по цепочке поставщиков.
+
+    Без target_ids продукты получают все подчинённые на любой глубине,
+    иначе — перечисленные звенья и промежуточные звенья между ними
+    и источником, чтобы каждое звено продавало то, что есть у его
+    поставщика. Продукты, уже имеющиеся у звена, пропускаются.
+    Выполняется за три запроса чтения и запись порциями bulk_create
+    независимо от размера дерева.
+
+    Возвращает словарь с числом звеньев-получателей, созданных
+    и пропущенных продуктов.
+    """
+    products = source.products.all()
+    if product_ids is not None:
+        products = products.filter(pk__in=product_ids)
+    catalog_ids = list(products.values_list("catalog_product_id", flat=True))
+    if product_ids is not None and len(catalog_ids) < len(set(product_ids)):
+        raise ValidationError(
+            {"products": ["Продукты должны принадлежать звену-источнику."]}
+        )
+    descendants = source.get_descendants()
+    if target_ids is not None:
+        descendants = descendants.filter(pk__in=target_ids)
+    found = dict(descendants.values_list("pk", "path"))
+    if target_ids is not None and len(found) < len(set(target_ids)):
+        raise ValidationError(
+            {"subordinates": ["Звенья должны быть подчинёнными источника."]}
+        )
+    targets = set(found)
+    if target_ids is not None:
+        prefix_length = len(source.subtree_path)
+        separator = NetworkObject.PATH_SEPARATOR
+        for path in found.values():
+            targets.update(
+                int(pk) for pk in path[prefix_length:].split(separator) if pk
+            )
+    existing = set(
+        Product.objects.filter(
+            network_object_id__in=targets, catalog_product_id__in=catalog_ids
+        ).values_list("network_object_id", "catalog_product_id")
+    )
+    new_products = [
+        Product(network_object_id=target, catalog_product_id=catalog_id)
+        for target in sorted(targets)
+        for catalog_id in catalog_ids
+        if (target, catalog_id) not in existing
+    ]
+    with transaction.atomic():
+        Product.objects.bulk_create(
+            new_products, batch_size=settings.NETWORK_BULK_BATCH_SIZE
+        )
+        if new_products:
+            invalidate_network_cache()
+    return {
+        "targets": len(targets),
+        "created": len(new_products),
+        "skipped": len(targets) * len(catalog_ids) - len(new_products),
+    }
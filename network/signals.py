@@ -1,29 +1,86 @@
-from django.db.models.signals import pre_save
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from rest_framework.exceptions import ValidationError
 
-from network.models import NetworkObject
+from network.cache import invalidate_network_cache
+from network.models import CatalogProduct, NetworkObject, Product
+from network.rollups import refresh_debt_rollups, rollups_enabled
+from network.validators import ensure_supplier_chain_validated
 
 
 @receiver(pre_save, sender=NetworkObject)
-def check_network_constraints(sender, instance, **kwargs):
+def check_network_constraints(sender, instance, raw=False, **kwargs):
     """
     Проверяет ограничения на глубину и циклические связи для NetworkObject.
+
+    Если цепочка уже проверена в NetworkObject.clean() для того же
+    поставщика, повторная проверка не выполняется.
+    """
+    if raw:
+        return
+    try:
+        ensure_supplier_chain_validated(instance)
+    except DjangoValidationError as error:
+        raise ValidationError(error.messages)
+
+
+@receiver(post_delete, sender=NetworkObject)
+def detach_subordinates(sender, instance, **kwargs):
+    """
+    Пересчитывает иерархию подчинённых звеньев удалённого объекта:
+    прямые подчинённые становятся заводами, их цепочки сдвигаются.
+    """
+    level_delta = -(instance.level + 1)
+    children = NetworkObject.objects.filter(path=instance.subtree_path)
+    child_ids = list(children.values_list("pk", flat=True))
+    for child_id in child_ids:
+        NetworkObject.rebase_subtree(
+            f"{instance.subtree_path}{child_id}{NetworkObject.PATH_SEPARATOR}",
+            f"{child_id}{NetworkObject.PATH_SEPARATOR}",
+            level_delta,
+            child_id,
+        )
+    children.update(
+        path="", level=NetworkObject.Level.FACTORY, root_factory=None
+    )
+    refresh_debt_rollups(instance.ancestor_ids + child_ids)
+
+
+@receiver(post_save, sender=NetworkObject)
+def update_debt_rollups(sender, instance, created, raw=False, **kwargs):
+    """
+    Пересчитывает сводную задолженность поставщиков звена, если
+    изменились долг или поставщик.
+    """
+    stored = instance.__dict__.pop("_stored_state", None)
+    if raw or not rollups_enabled():
+        return
+    ids = set(instance.ancestor_ids)
+    if stored is not None:
+        if (
+            stored["path"] == instance.path
+            and stored["debt_to_supplier"] == instance.debt_to_supplier
+        ):
+            return
+        ids.update(
+            int(pk)
+            for pk in stored["path"].split(NetworkObject.PATH_SEPARATOR)
+            if pk
+        )
+    refresh_debt_rollups(ids)
+
+
+@receiver(post_save, sender=NetworkObject)
+@receiver(post_delete, sender=NetworkObject)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=CatalogProduct)
+@receiver(post_delete, sender=CatalogProduct)
+def invalidate_cached_responses(sender, **kwargs):
+    """
+    Сбрасывает кеш ответов сети. Версия кеша общая, поэтому вместе
+    со звеном сбрасываются и ответы по его поставщикам и подчинённым,
+    уровень которых мог измениться.
     """
-    if instance.supplier is not None and instance.pk == instance.supplier.pk:
-        raise ValidationError("Объект не может быть своим поставщиком.")
-    distance = 0
-    node = instance.supplier
-    visiting = set()
-    while node is not None:
-        if node.pk in visiting:
-            raise ValidationError(
-                "Обнаружена циклическая зависимость в цепочке поставщиков."
-            )
-        visiting.add(node.pk)
-        distance += 1
-        if distance > 2:
-            raise ValidationError(
-                "Глубина сети не может превышать 3 уровня (включая завод)."
-            )
-        node = node.supplier
+    invalidate_network_cache()
@@ -1,8 +1,9 @@
 from django.urls import include, path
 from rest_framework_nested import routers
 
+from . import async_views
 from .apps import NetworkConfig
-from .views import NetworkObjectViewSet
+from .views import NetworkObjectViewSet, ProductViewSet
 
 app_name = NetworkConfig.name
 
@@ -12,7 +13,31 @@ router.register(
     NetworkObjectViewSet,
     basename="network_objects"
 )
+router.register(r"products", ProductViewSet, basename="products")
+
+network_object_router = routers.NestedSimpleRouter(
+    router, r"network_objects", lookup="network_object"
+)
+network_object_router.register(
+    r"products", ProductViewSet, basename="network_object-products"
+)
 
 urlpatterns = [
     path("api/", include(router.urls)),
+    path("api/", include(network_object_router.urls)),
+    path(
+        "api/async/network_objects/",
+        async_views.network_object_list,
+        name="async_network_objects-list",
+    ),
+    path(
+        "api/async/network_objects/<int:pk>/",
+        async_views.network_object_detail,
+        name="async_network_objects-detail",
+    ),
+    path(
+        "api/async/network_objects/<int:pk>/tree/",
+        async_views.network_object_tree,
+        name="async_network_objects-tree",
+    ),
 ]
@@ -0,0 +1,203 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+MAX_LEVEL = 2
+
+SELF_SUPPLIER_MESSAGE = "Объект не может быть своим собственным поставщиком."
+CYCLE_MESSAGE = "Обнаружена циклическая связь."
+DEPTH_MESSAGE = "Цепочка поставщиков не может содержать более 3 звеньев."
+SUPPLIER_NOT_FOUND_MESSAGE = "Поставщик не найден."
+
+_NOT_VALIDATED = object()
+
+
+def _batch_supplier(obj):
+    """Возвращает закешированный объект поставщика без запроса к БД."""
+    descriptor = type(obj).supplier
+    if descriptor.is_cached(obj):
+        return obj.supplier
+    return None
+
+
+def _token_pk(token):
+    return token if isinstance(token, int) else token.pk
+
+
+class _ChainResolver:
+    """
+    Вычисляет цепочки поставщиков для пачки звеньев с учётом ссылок
+    на другие звенья той же пачки.
+    """
+
+    def __init__(self, objects, rows):
+        self.batch = {id(obj) for obj in objects}
+        self.by_pk = {obj.pk: obj for obj in objects if obj.pk is not None}
+        self.rows = rows
+        self.chains = {}
+        self.errors = {}
+        self.stack = set()
+
+    def resolve(self, obj):
+        """Возвращает список поставщиков звена от завода."""
+        key = id(obj)
+        if key in self.errors:
+            raise self.errors[key]
+        if key in self.chains:
+            return self.chains[key]
+        if key in self.stack:
+            raise ValidationError(CYCLE_MESSAGE)
+        self.stack.add(key)
+        try:
+            chain = self._build_chain(obj)
+            if any(
+                token is obj
+                or (obj.pk is not None and _token_pk(token) == obj.pk)
+                for token in chain
+            ):
+                raise ValidationError(CYCLE_MESSAGE)
+            if len(chain) > MAX_LEVEL:
+                raise ValidationError(DEPTH_MESSAGE)
+        except ValidationError as error:
+            self.errors[key] = error
+            raise
+        finally:
+            self.stack.discard(key)
+        self.chains[key] = chain
+        return chain
+
+    def _build_chain(self, obj):
+        supplier = _batch_supplier(obj)
+        if supplier is not None and id(supplier) not in self.batch:
+            supplier = self.by_pk.get(supplier.pk)
+        if supplier is None and obj.supplier_id is not None:
+            supplier = self.by_pk.get(obj.supplier_id)
+        if supplier is obj or (
+            obj.pk is not None and obj.supplier_id == obj.pk
+        ):
+            raise ValidationError(SELF_SUPPLIER_MESSAGE)
+        if supplier is not None:
+            return self.resolve(supplier) + [supplier]
+        if obj.supplier_id is None:
+            return []
+        row = self.rows.get(obj.supplier_id)
+        if row is None:
+            raise ValidationError(SUPPLIER_NOT_FOUND_MESSAGE)
+        ancestors = row["ancestor_ids"] + [row["pk"]]
+        for index in range(len(ancestors) - 1, -1, -1):
+            pending = self.by_pk.get(ancestors[index])
+            if pending is not None:
+                return (
+                    self.resolve(pending) + [pending] + ancestors[index + 1:]
+                )
+        return ancestors
+
+
+def _chain_rows(objects):
+    """
+    Читает из базы звенья списка и их поставщиков одним запросом:
+    {pk: {"pk", "path", "level", "root_factory_id", "ancestor_ids"}}.
+    """
+    model = objects[0]._meta.model
+    separator = model.PATH_SEPARATOR
+    lookup_ids = {obj.pk for obj in objects if obj.pk is not None}
+    lookup_ids.update(
+        obj.supplier_id for obj in objects if obj.supplier_id is not None
+    )
+    rows = {}
+    if lookup_ids:
+        for row in model._default_manager.filter(pk__in=lookup_ids).values(
+            "pk", "path", "level", "root_factory_id"
+        ):
+            row["ancestor_ids"] = [
+                int(pk) for pk in row["path"].split(separator) if pk
+            ]
+            rows[row["pk"]] = row
+    return rows
+
+
+def resolve_supplier_chains(objects, rows=None):
+    """
+    Вычисляет уровни и проверяет цепочки поставщиков для списка звеньев
+    за постоянное число запросов.
+
+    Поставщиком может быть звено из базы или другое звено того же списка,
+    ещё не сохранённое. Возвращает пару словарей
+    ({индекс: уровень}, {индекс: ошибка}).
+    """
+    objects = list(objects)
+    if not objects:
+        return {}, {}
+    model = objects[0]._meta.model
+    separator = model.PATH_SEPARATOR
+    if rows is None:
+        rows = _chain_rows(objects)
+    resolver = _ChainResolver(objects, rows)
+    errors = {}
+    levels = {}
+    for index, obj in enumerate(objects):
+        try:
+            levels[index] = len(resolver.resolve(obj))
+        except ValidationError as error:
+            errors[index] = error
+    deeper = {
+        index: rows[obj.pk]
+        for index, obj in enumerate(objects)
+        if index in levels
+        and obj.pk in rows
+        and levels[index] > rows[obj.pk]["level"]
+    }
+    if deeper:
+        prefixes = {
+            index: f"{row['path']}{row['pk']}{separator}"
+            for index, row in deeper.items()
+        }
+        condition = Q()
+        for prefix in prefixes.values():
+            condition |= Q(path__startswith=prefix)
+        descendants = model._default_manager.filter(condition).values_list(
+            "path", "level"
+        )
+        heights = {}
+        for path, level in descendants:
+            for index, prefix in prefixes.items():
+                if path.startswith(prefix):
+                    height = level - deeper[index]["level"]
+                    heights[index] = max(heights.get(index, 0), height)
+        for index, height in heights.items():
+            if levels[index] + height > MAX_LEVEL:
+                errors[index] = ValidationError(DEPTH_MESSAGE)
+                del levels[index]
+    return levels, errors
+
+
+def check_supplier_chains(objects):
+    """
+    Проверяет цепочки поставщиков для списка звеньев.
+
+    Возвращает словарь {индекс в списке: ошибка}.
+    """
+    return resolve_supplier_chains(objects)[1]
+
+
+def validate_supplier_chain(instance):
+    """
+    Проверяет цепочку поставщиков одного звена и запоминает результат,
+    чтобы сигнал pre_save не повторял проверку, и прочитанную строку
+    поставщика, по которой save() пересчитывает иерархию.
+    """
+    rows = _chain_rows([instance])
+    errors = resolve_supplier_chains([instance], rows)[1]
+    if errors:
+        raise errors[0]
+    instance._validated_supplier_id = instance.supplier_id
+    instance._supplier_row = rows.get(instance.supplier_id)
+
+
+def ensure_supplier_chain_validated(instance):
+    """Проверяет цепочку, если она ещё не проверена для этого поставщика."""
+    validated = instance.__dict__.pop(
+        "_validated_supplier_id", _NOT_VALIDATED
+    )
+    if validated is _NOT_VALIDATED or validated != instance.supplier_id:
+        validate_supplier_chain(instance)
+        instance.__dict__.pop("_validated_supplier_id", None)
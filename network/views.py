@@ -1,17 +1,92 @@
+import hashlib
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
-from rest_framework.exceptions import ValidationError
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
-from .models import NetworkObject
-from .serializers import NetworkObjectSerializer
+from config.db_router import ReplicaReadMixin, in_current_context
+
+from .cache import CachedResponseMixin, build_cache_key, get_cache_stats
+from .exporters import DATASETS, EXPORT_FORMATS, stream_export
+from .filters import NetworkObjectFilter, ProductFilter
+from .models import NetworkObject, Product
+from .paginators import NetworkObjectCursorPagination, ProductCursorPagination
+from .parsers import NDJSONParser
+from .rollups import get_debt_rollups
+from .search import FullTextSearchFilter
+from .serializers import (DebtRollupSerializer, NetworkObjectSerializer,
+                          ProductPropagationSerializer, ProductSerializer)
+from .services import (build_supplier_tree, bulk_save_network_objects,
+                       clear_debt, propagate_products)
+
+
+def tree_etag(request):
+    """
+    Возвращает ETag дерева звеньев по версии кеша ответов сети, пути,
+    параметрам запроса и области пользователя. Версия меняется при любой
+    записи в сеть, поэтому ETag вычисляется до сборки дерева: ответ 304
+    не читает поддерево и не сериализует его.
+    """
+    digest = hashlib.md5(
+        build_cache_key(request, "tree").encode(), usedforsecurity=False
+    )
+    return quote_etag(digest.hexdigest())
+
 
+def content_etag(data):
+    """
+    Возвращает ETag по содержимому ответа. Используется, когда кеш ответов
+    сети выключен: версия кеша в LocMemCache своя у каждого воркера и не
+    меняется при записи через другой воркер.
+    """
+    raw = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    digest = hashlib.md5(raw.encode(), usedforsecurity=False)
+    return quote_etag(digest.hexdigest())
 
-class NetworkObjectViewSet(viewsets.ModelViewSet):
-    queryset = NetworkObject.objects.all()
+
+class NetworkObjectViewSet(ReplicaReadMixin, CachedResponseMixin,
+                           viewsets.ModelViewSet):
+    queryset = NetworkObject.objects.defer("search_vector")
     serializer_class = NetworkObjectSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ["country"]
+    lookup_value_regex = r"\d+"
+    pagination_class = NetworkObjectCursorPagination
+    filter_backends = [
+        DjangoFilterBackend,
+        FullTextSearchFilter,
+        filters.OrderingFilter,
+    ]
+    filterset_class = NetworkObjectFilter
+    # Только поля с индексом: сортировка по ним не читает всю таблицу.
+    ordering_fields = ("created_at", "id", "name", "country", "city")
+    search_vector = "search_vector"
+    search_fields = ("name", "city")
+
+    def get_queryset(self):
+        """Загружает только запрошенные в ?fields= столбцы."""
+        queryset = super().get_queryset()
+        if self.action != "list":
+            return queryset
+        only_fields = self.get_serializer_class().get_only_fields(
+            self.request
+        )
+        if only_fields is None:
+            return queryset
+        ordering = self.paginator.get_ordering(
+            self.request, queryset, self
+        )
+        only_fields.update(field.lstrip("-") for field in ordering)
+        only_fields.add("id")
+        return queryset.only(*only_fields)
 
     def perform_create(self, serializer):
         try:
@@ -31,3 +106,223 @@ class NetworkObjectViewSet(viewsets.ModelViewSet):
                 {"detail": f"Произошла непредвиденная ошибка: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        parser_classes=[JSONParser, NDJSONParser],
+    )
+    def bulk(self, request):
+        """
+        Создаёт и обновляет звенья сети пачкой из JSON-массива или NDJSON.
+        """
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response(
+                {"detail": "Ожидается массив объектов."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(rows) > settings.NETWORK_BULK_MAX_ROWS:
+            return Response(
+                {
+                    "detail": "Пачка не может содержать более "
+                    f"{settings.NETWORK_BULK_MAX_ROWS} строк."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        result = bulk_save_network_objects(rows)
+        if result["errors"] and not (result["created"] or result["updated"]):
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """
+        Потоково выгружает звенья сети или продукты в CSV или NDJSON.
+
+        Параметры: dataset (network_objects или products) и file_format
+        (csv или ndjson). Фильтры списка применяются к звеньям сети.
+        """
+        dataset = request.query_params.get("dataset", "network_objects")
+        file_format = request.query_params.get("file_format", "csv")
+        if dataset not in DATASETS or file_format not in EXPORT_FORMATS:
+            return Response(
+                {
+                    "detail": "Допустимые значения: dataset — "
+                    f"{', '.join(DATASETS)}; file_format — "
+                    f"{', '.join(EXPORT_FORMATS)}."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = None
+        if dataset == "network_objects":
+            queryset = self.filter_queryset(NetworkObject.objects.all())
+        response = StreamingHttpResponse(
+            in_current_context(stream_export(dataset, file_format, queryset)),
+            content_type=EXPORT_FORMATS[file_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{dataset}.{file_format}"'
+        )
+        return response
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="clear_debt",
+        permission_classes=[IsAdminUser],
+    )
+    def clear_debt(self, request):
+        """
+        Очищает задолженность перед поставщиком у звеньев, отобранных
+        по фильтрам country, city, level и supplier.
+        """
+        filterset = NetworkObjectFilter(
+            request.data, queryset=NetworkObject.objects.all()
+        )
+        if not filterset.is_valid():
+            return Response(
+                filterset.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+        applied = {
+            name: request.data[name]
+            for name in filterset.filters
+            if request.data.get(name) not in (None, "")
+        }
+        if not applied:
+            return Response(
+                {"detail": "Укажите хотя бы один фильтр."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        clearance = clear_debt(filterset.qs, request.user, applied)
+        if clearance is None:
+            return Response({"objects_count": 0, "total_amount": "0.00"})
+        return Response(
+            {
+                "objects_count": clearance.objects_count,
+                "total_amount": str(clearance.total_amount),
+            }
+        )
+
+    @action(detail=True, methods=["get"], url_path="tree")
+    def tree(self, request, pk=None):
+        """
+        Возвращает дерево подчинённых звена.
+
+        Параметры: depth — глубина дерева, products=1 — добавить продукты.
+        Поддерживает условный запрос по заголовку If-None-Match.
+        """
+        depth = request.query_params.get("depth")
+        if depth is not None:
+            if not depth.isdigit():
+                return Response(
+                    {"depth": "Ожидается неотрицательное целое число."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            depth = int(depth)
+        with_products = request.query_params.get("products") in ("1", "true")
+        build = partial(
+            build_supplier_tree,
+            self.get_object(),
+            self.get_serializer_class(),
+            self.get_serializer_context(),
+            depth=depth,
+            with_products=with_products,
+        )
+        tree = None if settings.NETWORK_CACHE_ENABLED else build()
+        etag = tree_etag(request) if tree is None else content_etag(tree)
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(build() if tree is None else tree)
+        response["ETag"] = etag
+        return response
+
+    @action(detail=True, methods=["post"], url_path="propagate_products")
+    def propagate_products(self, request, pk=None):
+        """
+        Копирует продукты звена подчинённым. Параметры: products — id
+        продуктов звена (по умолчанию все), subordinates — id подчинённых
+        (по умолчанию все на любой глубине).
+        """
+        serializer = ProductPropagationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = propagate_products(
+            self.get_object(),
+            serializer.validated_data.get("products"),
+            serializer.validated_data.get("subordinates"),
+        )
+        return Response(result)
+
+    @action(detail=False, methods=["get"], url_path="debt_rollups")
+    def debt_rollups(self, request):
+        """
+        Возвращает задолженность перед каждым поставщиком: прямых
+        подчинённых и всего дерева под ним. Параметр level=0 оставляет
+        только заводы.
+        """
+        level = request.query_params.get("level")
+        if level is not None and level not in ("0", "1", "2"):
+            return Response(
+                {"level": "Допустимые значения: 0, 1, 2."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        rollups = get_debt_rollups(None if level is None else int(level))
+        return Response(DebtRollupSerializer(rollups, many=True).data)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="cache_stats",
+        permission_classes=[IsAdminUser],
+    )
+    def cache_stats(self, request):
+        """Возвращает счётчики попаданий и промахов кеша ответов."""
+        return Response(get_cache_stats())
+
+
+class ProductViewSet(viewsets.ModelViewSet):
+    """
+    Продукты всех звеньев (/products/) или одного звена
+    (/network_objects/{id}/products/). Звено и модель каталога читаются
+    тем же запросом, что и продукты. Во вложенном маршруте несуществующее
+    звено даёт 404.
+    """
+
+    serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
+    filterset_class = ProductFilter
+    search_vector = "catalog_product__search_vector"
+    search_fields = ("catalog_product__name", "catalog_product__model")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        network_object_pk = self.kwargs.get("network_object_pk")
+        if (
+            network_object_pk is not None
+            and not NetworkObject.objects.filter(
+                pk=network_object_pk
+            ).exists()
+        ):
+            raise NotFound("Звено сети не найдено.")
+
+    def get_queryset(self):
+        queryset = Product.objects.select_related(
+            "network_object", "catalog_product"
+        ).defer(
+            "network_object__search_vector", "catalog_product__search_vector"
+        )
+        network_object_pk = self.kwargs.get("network_object_pk")
+        if network_object_pk is not None:
+            queryset = queryset.filter(network_object_id=network_object_pk)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        """Во вложенном маршруте звено берётся из URL."""
+        if "network_object_pk" in self.kwargs and "data" in kwargs:
+            data = kwargs["data"].copy()
+            data["network_object"] = self.kwargs["network_object_pk"]
+            kwargs["data"] = data
+        return super().get_serializer(*args, **kwargs)
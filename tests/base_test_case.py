@@ -1,15 +1,17 @@
-from rest_framework.test import APIClient, APITestCase
+from django.core.cache import cache
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from network.models import NetworkObject
 from users.models import User
 
 
-class BaseTestCase(APITestCase):
-    """Базовый тестовый класс."""
+class BaseTestMixin:
+    """Общие методы тестовых классов."""
 
     def setUp(self):
         """Метод для инициализации тестов."""
+        cache.clear()
         self.user = self.create_user()
         self.client.force_authenticate(user=self.user)
 
@@ -37,3 +39,14 @@ class BaseTestCase(APITestCase):
         }
         default_data.update(kwargs)
         return NetworkObject.objects.create(**default_data)
+
+
+class BaseTestCase(BaseTestMixin, APITestCase):
+    """Базовый тестовый класс."""
+
+
+class BaseTransactionTestCase(BaseTestMixin, APITransactionTestCase):
+    """
+    Базовый тестовый класс с фиксацией транзакций: данные видны через
+    другие соединения, например через реплику.
+    """
@@ -0,0 +1,162 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from network.models import DebtClearance, NetworkObject, Product
+
+from .base_test_case import BaseTestCase
+
+CHANGELIST_URL = reverse("admin:network_networkobject_changelist")
+
+
+class NetworkObjectAdminTests(BaseTestCase):
+    """Тесты для NetworkObjectAdmin."""
+
+    def setUp(self):
+        super().setUp()
+        self.user.is_staff = True
+        self.user.is_superuser = True
+        self.user.save()
+        self.client.force_login(self.user)
+
+    def create_chain(self, number):
+        factory = self.create_network_object(name=f"Завод {number}")
+        retail = self.create_network_object(
+            name=f"Сеть {number}", supplier=factory
+        )
+        self.create_network_object(name=f"ИП {number}", supplier=retail)
+
+    def count_changelist_queries(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(CHANGELIST_URL, params)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelist_query_count_does_not_grow(self):
+        """Тестирование отсутствия N+1 запросов в списке звеньев сети."""
+        self.create_chain(1)
+        queries = self.count_changelist_queries()
+        for number in range(2, 6):
+            self.create_chain(number)
+        self.assertEqual(self.count_changelist_queries(), queries)
+
+    def test_changelist_ordering_by_level(self):
+        """Тестирование сортировки списка звеньев сети по уровню."""
+        self.create_chain(1)
+        response = self.client.get(CHANGELIST_URL, {"o": "7"})
+        self.assertEqual(response.status_code, 200)
+        levels = [obj.level for obj in response.context["cl"].result_list]
+        self.assertEqual(levels, sorted(levels))
+
+    def test_supplier_autocomplete(self):
+        """Тестирование автодополнения поставщика."""
+        self.create_chain(1)
+        response = self.client.get(
+            reverse("admin:autocomplete"),
+            {
+                "term": "Завод",
+                "app_label": "network",
+                "model_name": "networkobject",
+                "field_name": "supplier",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["results"]), 1)
+
+    def test_propagate_products_action(self):
+        """Тестирование admin action передачи продуктов подчинённым."""
+        self.create_chain(1)
+        factory = NetworkObject.objects.get(name="Завод 1")
+        Product.objects.create(
+            name="Телефон",
+            model="X1",
+            release_date="2024-01-01",
+            network_object=factory,
+        )
+        response = self.client.post(
+            CHANGELIST_URL,
+            {
+                "action": "propagate_products",
+                "_selected_action": [factory.pk],
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            Product.objects.filter(catalog_product__model="X1").count(), 3
+        )
+
+    def test_clear_debt_action_records_cleared_ids(self):
+        """
+        Тестирование журнала admin action очистки задолженности:
+        записываются id очищенных звеньев, а не параметры страницы.
+        """
+        with_debt = self.create_network_object(debt_to_supplier="10.00")
+        without_debt = self.create_network_object(debt_to_supplier="0.00")
+        other = self.create_network_object(debt_to_supplier="5.00")
+        response = self.client.post(
+            f"{CHANGELIST_URL}?city=Москва",
+            {
+                "action": "clear_debt",
+                "_selected_action": [with_debt.pk, without_debt.pk],
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        clearance = DebtClearance.objects.get()
+        self.assertEqual(clearance.objects_count, 1)
+        self.assertEqual(clearance.filters["source"], "admin")
+        self.assertEqual(clearance.filters["cleared_ids"], [with_debt.pk])
+        other.refresh_from_db()
+        self.assertEqual(str(other.debt_to_supplier), "5.00")
+
+    def test_product_admin_search(self):
+        """Тестирование поиска продуктов по каталогу в админке."""
+        self.create_chain(1)
+        Product.objects.create(
+            name="Телефон",
+            model="X1",
+            release_date="2024-01-01",
+            network_object=NetworkObject.objects.get(name="Завод 1"),
+        )
+        response = self.client.get(
+            reverse("admin:network_product_changelist"), {"q": "x1"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_count, 1)
+
+    def test_changelist_search(self):
+        """Тестирование поиска звеньев сети в админке."""
+        self.create_chain(1)
+        self.create_chain(2)
+        response = self.client.get(CHANGELIST_URL, {"q": "Сеть 2"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [obj.name for obj in response.context["cl"].result_list],
+            ["Сеть 2"],
+        )
+
+    def test_factory_inline_adds_catalog_product(self):
+        """Тестирование добавления продукта заводу через инлайн."""
+        factory = self.create_network_object(name="Завод")
+        url = reverse(
+            "admin:network_networkobject_change", args=[factory.pk]
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        data = {
+            "name": factory.name,
+            "email": factory.email,
+            "country": factory.country,
+            "city": factory.city,
+            "street": factory.street,
+            "house_number": factory.house_number,
+            "debt_to_supplier": factory.debt_to_supplier,
+            "products-TOTAL_FORMS": "1",
+            "products-INITIAL_FORMS": "0",
+            "products-0-name": "Телефон",
+            "products-0-model": "X1",
+            "products-0-release_date": "01.01.2024",
+            "products-0-network_object": factory.pk,
+        }
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(factory.products.get().model, "X1")
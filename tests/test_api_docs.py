@@ -0,0 +1,64 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+from config.api_docs import clear_schema_cache
+
+from .base_test_case import BaseTestCase
+
+
+class ApiDocsTests(BaseTestCase):
+    """Тесты документации API."""
+
+    def setUp(self):
+        super().setUp()
+        clear_schema_cache()
+        self.addCleanup(clear_schema_cache)
+
+    def get_schema(self):
+        return self.client.get(
+            reverse("schema-swagger-ui"), {"format": "openapi"}
+        )
+
+    def test_openapi_schema(self):
+        """Тестирование схемы, собираемой при первом запросе."""
+        response = self.get_schema()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("/network/api/network_objects/", response.data["paths"])
+
+    def test_openapi_schema_cached(self):
+        """Тестирование кеша схемы по версии кода."""
+        with mock.patch.object(
+            OpenAPISchemaGenerator,
+            "get_schema",
+            autospec=True,
+            side_effect=OpenAPISchemaGenerator.get_schema,
+        ) as get_schema:
+            with override_settings(CODE_VERSION="1"):
+                self.assertEqual(self.get_schema().status_code, 200)
+                self.assertEqual(self.get_schema().status_code, 200)
+                self.assertEqual(get_schema.call_count, 1)
+            with override_settings(CODE_VERSION="2"):
+                self.assertEqual(self.get_schema().status_code, 200)
+                self.assertEqual(get_schema.call_count, 2)
+
+    def test_generate_openapi_schema(self):
+        """Тестирование выгрузки схемы в статический файл."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            call_command(
+                "generate_openapi_schema",
+                output_dir=output_dir,
+                formats=["json"],
+                stdout=StringIO(),
+            )
+            path = Path(output_dir) / "schema.json"
+            schema = json.loads(path.read_text(encoding="utf-8"))
+            self.assertFalse((Path(output_dir) / "schema.yaml").exists())
+        self.assertIn("/network/api/network_objects/", schema["paths"])
@@ -0,0 +1,98 @@
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.metrics import registry
+
+from .base_test_case import BaseTestCase
+
+NETWORK_OBJECTS_URL = reverse("network:network_objects-list")
+METRICS_URL = reverse("metrics")
+LIST_LABELS = 'view="network:network_objects-list",method="GET"'
+ASYNC_LIST_LABELS = (
+    'view="network:async_network_objects-list",method="GET"'
+)
+
+
+class MetricsTests(BaseTestCase):
+    """Тесты метрик запросов."""
+
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+
+    @override_settings(NETWORK_CACHE_ENABLED=True)
+    def test_metrics_endpoint(self):
+        """
+        Тестирование гистограмм по имени маршрута: второй ответ берётся
+        из кеша без SQL-запросов.
+        """
+        self.create_network_object(name="Завод")
+        self.client.get(NETWORK_OBJECTS_URL)
+        self.client.get(NETWORK_OBJECTS_URL)
+        response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn(
+            f"http_request_duration_seconds_count{{{LIST_LABELS}}} 2", body
+        )
+        self.assertIn(
+            f'http_request_db_queries_bucket{{{LIST_LABELS},le="0"}} 1',
+            body,
+        )
+        self.assertIn(
+            f'http_request_db_queries_bucket{{{LIST_LABELS},le="1"}} 2',
+            body,
+        )
+        self.assertIn(
+            f"http_request_serializer_duration_seconds_count{{{LIST_LABELS}}}",
+            body,
+        )
+        self.assertNotIn('view="metrics"', body)
+
+    def test_async_view_queries(self):
+        """Тестирование SQL-запросов асинхронного представления."""
+        self.create_network_object(name="Завод")
+        token = RefreshToken.for_user(self.user).access_token
+        response = async_to_sync(AsyncClient().get)(
+            reverse("network:async_network_objects-list"),
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        body = registry.render()
+        self.assertIn(
+            f"http_request_db_queries_count{{{ASYNC_LIST_LABELS}}} 1", body
+        )
+        self.assertIn(
+            f'http_request_db_queries_bucket{{{ASYNC_LIST_LABELS},le="0"}} 0',
+            body,
+        )
+
+    @override_settings(METRICS_SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        """Тестирование заголовка Server-Timing."""
+        response = self.client.get(NETWORK_OBJECTS_URL)
+        self.assertIn('db;dur=', response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+    def test_server_timing_disabled(self):
+        """Тестирование отсутствия Server-Timing по умолчанию."""
+        response = self.client.get(NETWORK_OBJECTS_URL)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(METRICS_QUERY_COUNT_THRESHOLD=0)
+    def test_slow_request_logged(self):
+        """Тестирование журнала запросов с большим числом SQL-запросов."""
+        with self.assertLogs("config.metrics", "WARNING") as logs:
+            self.client.get(NETWORK_OBJECTS_URL)
+        self.assertIn("network:network_objects-list", logs.output[0])
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        """Тестирование доступа к метрикам по токену."""
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        response = self.client.get(
+            METRICS_URL, HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, 200)
@@ -1,10 +1,20 @@
+import json
+from decimal import Decimal
+from io import StringIO
+
 import pytest
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 
-from network.models import NetworkObject
+from network.models import (CatalogProduct, DebtClearance, DebtRollup,
+                            NetworkObject, Product)
+from network.services import clear_debt
+from network.validators import check_supplier_chains, validate_supplier_chain
 from users.models import User
 
 from .base_test_case import BaseTestCase
@@ -64,7 +74,68 @@ class NetworkObjectTests(BaseTestCase):
         self.create_network_object(name="Объект 2")
         response = self.client.get(NETWORK_OBJECTS_URL, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_list_network_objects_cursor_pagination(self):
+        """Тестирование постраничного вывода по курсору."""
+        for number in range(3):
+            self.create_network_object(name=f"Объект {number}")
+        response = self.client.get(
+            NETWORK_OBJECTS_URL, {"page_size": 2}, format="json"
+        )
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(response.data["results"][0]["name"], "Объект 2")
+        response = self.client.get(response.data["next"], format="json")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["name"], "Объект 0")
+        self.assertIsNone(response.data["next"])
+
+    def test_list_network_objects_ordering(self):
+        """
+        Тестирование сортировки: только по полям с индексом, строки
+        с равным ключом упорядочены по id.
+        """
+        objects = [
+            self.create_network_object(name=name)
+            for name in ("Б", "А", "Б", "А")
+        ]
+        names = []
+        url = NETWORK_OBJECTS_URL
+        params = {"ordering": "name", "page_size": 1}
+        while url:
+            response = self.client.get(url, params, format="json")
+            names.extend(
+                (row["name"], row["id"]) for row in response.data["results"]
+            )
+            url, params = response.data["next"], None
+        self.assertEqual(
+            names,
+            [
+                ("А", objects[3].pk),
+                ("А", objects[1].pk),
+                ("Б", objects[2].pk),
+                ("Б", objects[0].pk),
+            ],
+        )
+        response = self.client.get(
+            NETWORK_OBJECTS_URL, {"ordering": "debt_to_supplier"}
+        )
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]],
+            [obj.pk for obj in reversed(objects)],
+        )
+
+    def test_list_network_objects_sparse_fields(self):
+        """Тестирование выбора полей через параметр fields."""
+        self.create_network_object(name="Объект 1")
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                NETWORK_OBJECTS_URL, {"fields": "id,name"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data["results"][0]), {"id", "name"}
+        )
 
     def test_retrieve_network_object(self):
         """Тестирование получения одного объекта NetworkObject."""
@@ -134,8 +205,8 @@ class NetworkObjectTests(BaseTestCase):
         url = f"{NETWORK_OBJECTS_URL}?country=Россия"
         response = self.client.get(url, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        for obj in response.data:
+        self.assertEqual(len(response.data["results"]), 2)
+        for obj in response.data["results"]:
             self.assertEqual(obj["country"], "Россия")
 
     def test_level_property_factory(self):
@@ -199,3 +270,827 @@ class NetworkObjectTests(BaseTestCase):
         with pytest.raises(ValidationError) as excinfo:
             supplier1.full_clean()
         self.assertIn("Обнаружена циклическая связь.", excinfo.value.messages)
+
+    def test_hierarchy_materialized_on_create(self):
+        """Тестирование сохранения уровня, завода и цепочки поставщиков."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(supplier=factory)
+        entrepreneur = self.create_network_object(supplier=retail)
+        entrepreneur.refresh_from_db()
+        self.assertEqual(entrepreneur.level, 2)
+        self.assertEqual(entrepreneur.root_factory_id, factory.pk)
+        self.assertEqual(entrepreneur.path, f"{factory.pk}/{retail.pk}/")
+        self.assertEqual(entrepreneur.ancestor_ids, [factory.pk, retail.pk])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                str(entrepreneur),
+                "Объект(Индивидуальный предприниматель)"
+            )
+
+    def test_hierarchy_cascades_on_supplier_change(self):
+        """Тестирование пересчёта подчинённых при смене поставщика."""
+        factory = self.create_network_object(name="Завод")
+        other_factory = self.create_network_object(name="Другой завод")
+        retail = self.create_network_object(supplier=other_factory)
+        other_factory.supplier = factory
+        other_factory.save()
+        retail.refresh_from_db()
+        self.assertEqual(retail.level, 2)
+        self.assertEqual(retail.root_factory_id, factory.pk)
+        self.assertEqual(retail.path, f"{factory.pk}/{other_factory.pk}/")
+
+    def test_hierarchy_saved_with_update_fields(self):
+        """Тестирование смены поставщика через save(update_fields)."""
+        factory = self.create_network_object(name="Завод")
+        other_factory = self.create_network_object(name="Другой завод")
+        retail = self.create_network_object(supplier=factory)
+        entrepreneur = self.create_network_object(supplier=retail)
+        retail.supplier = other_factory
+        retail.save(update_fields=["supplier"])
+        retail.refresh_from_db()
+        entrepreneur.refresh_from_db()
+        self.assertEqual(retail.root_factory_id, other_factory.pk)
+        self.assertEqual(retail.path, f"{other_factory.pk}/")
+        self.assertEqual(
+            entrepreneur.path, f"{other_factory.pk}/{retail.pk}/"
+        )
+
+    def test_hierarchy_from_stale_supplier_instance(self):
+        """Тестирование иерархии при устаревшем объекте поставщика."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(supplier=factory)
+        entrepreneur = self.create_network_object(supplier=retail)
+        retail.supplier = None
+        retail.save()
+        self.assertEqual(entrepreneur.level, 2)
+        node = self.create_network_object(supplier=entrepreneur)
+        node.refresh_from_db()
+        self.assertEqual(node.level, 2)
+        self.assertEqual(node.path, f"{retail.pk}/{entrepreneur.pk}/")
+        self.assertEqual(node.root_factory_id, retail.pk)
+
+    def test_hierarchy_rebuilt_on_supplier_delete(self):
+        """Тестирование пересчёта подчинённых при удалении поставщика."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(supplier=factory)
+        entrepreneur = self.create_network_object(supplier=retail)
+        factory.delete()
+        retail.refresh_from_db()
+        entrepreneur.refresh_from_db()
+        self.assertEqual(retail.level, 0)
+        self.assertIsNone(retail.root_factory_id)
+        self.assertEqual(retail.path, "")
+        self.assertEqual(entrepreneur.level, 1)
+        self.assertEqual(entrepreneur.root_factory_id, retail.pk)
+        self.assertEqual(entrepreneur.path, f"{retail.pk}/")
+
+    def test_create_network_object_with_too_deep_supplier(self):
+        """Тестирование ошибки 400 при превышении глубины цепочки."""
+        factory = self.create_network_object()
+        retail = self.create_network_object(supplier=factory)
+        entrepreneur = self.create_network_object(supplier=retail)
+        data = {
+            "name": "Лишнее звено",
+            "email": "deep@example.com",
+            "country": "Россия",
+            "city": "Москва",
+            "street": "Пушкинская",
+            "house_number": "20",
+            "supplier": entrepreneur.pk,
+        }
+        response = self.client.post(NETWORK_OBJECTS_URL, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("supplier", response.data)
+
+    def test_clean_subtree_depth_validation(self):
+        """Тестирование проверки глубины подчинённых при смене поставщика."""
+        factory = self.create_network_object(name="Завод")
+        other_factory = self.create_network_object(name="Другой завод")
+        retail = self.create_network_object(supplier=other_factory)
+        self.create_network_object(supplier=retail)
+        other_factory.supplier = factory
+        with pytest.raises(ValidationError) as excinfo:
+            other_factory.full_clean()
+        self.assertIn(
+            "Цепочка поставщиков не может содержать более 3 звеньев.",
+            excinfo.value.messages,
+        )
+
+    def test_supplier_chain_validation_query_count(self):
+        """Тестирование проверки цепочки одним запросом при сохранении."""
+        factory = self.create_network_object()
+        retail = self.create_network_object(supplier=factory)
+        entrepreneur = NetworkObject(
+            name="ИП",
+            country="Россия",
+            city="Москва",
+            street="Пушкинская",
+            house_number="20",
+            supplier=retail,
+        )
+        with self.assertNumQueries(1):
+            validate_supplier_chain(entrepreneur)
+
+    def test_check_supplier_chains_batch(self):
+        """Тестирование пакетной проверки со ссылками внутри пачки."""
+        factory = self.create_network_object()
+        retail = NetworkObject(name="Сеть", supplier=factory)
+        entrepreneur = NetworkObject(name="ИП", supplier=retail)
+        too_deep = NetworkObject(name="Лишнее звено", supplier=entrepreneur)
+        with self.assertNumQueries(1):
+            errors = check_supplier_chains(
+                [too_deep, entrepreneur, retail]
+            )
+        self.assertEqual(list(errors), [0])
+        self.assertIn(
+            "Цепочка поставщиков не может содержать более 3 звеньев.",
+            errors[0].messages,
+        )
+
+    def test_bulk_create_with_references_inside_batch(self):
+        """Тестирование пакетного создания со ссылками внутри пачки."""
+        factory = self.create_network_object(name="Завод")
+        address = {
+            "country": "Россия",
+            "city": "Москва",
+            "street": "Пушкинская",
+            "house_number": "20",
+        }
+        rows = [
+            {"name": "ИП", "supplier_ref": "retail", **address},
+            {"name": "Сеть", "ref": "retail", "supplier": factory.pk,
+             **address},
+            {"name": "Лишнее звено", "supplier_ref": "ip", **address},
+            {"name": "Без адреса"},
+        ]
+        rows[0]["ref"] = "ip"
+        response = self.client.post(
+            f"{NETWORK_OBJECTS_URL}bulk/", rows, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(
+            [error["index"] for error in response.data["errors"]], [2, 3]
+        )
+        entrepreneur = NetworkObject.objects.get(name="ИП")
+        self.assertEqual(entrepreneur.level, 2)
+        self.assertEqual(entrepreneur.supplier.name, "Сеть")
+        self.assertEqual(entrepreneur.root_factory_id, factory.pk)
+
+    def test_bulk_ndjson_update(self):
+        """Тестирование пакетного обновления в формате NDJSON."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(name="Сеть")
+        body = (
+            f'{{"id": {retail.pk}, "supplier": {factory.pk}}}\n'
+            f'{{"id": {factory.pk}, "city": "Тверь"}}\n'
+        )
+        response = self.client.post(
+            f"{NETWORK_OBJECTS_URL}bulk/",
+            body,
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 2)
+        retail.refresh_from_db()
+        factory.refresh_from_db()
+        self.assertEqual(retail.level, 1)
+        self.assertEqual(retail.name, "Сеть")
+        self.assertEqual(factory.city, "Тверь")
+
+    def test_bulk_create_under_moved_supplier(self):
+        """Тестирование создания звена под поставщиком, перенесённым пачкой."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(name="Сеть", supplier=factory)
+        entrepreneur = self.create_network_object(name="ИП", supplier=retail)
+        rows = [
+            {"id": retail.pk, "supplier": None},
+            {
+                "name": "Новое ИП",
+                "country": "Россия",
+                "city": "Москва",
+                "street": "Пушкинская",
+                "house_number": "20",
+                "supplier": entrepreneur.pk,
+            },
+        ]
+        response = self.client.post(
+            f"{NETWORK_OBJECTS_URL}bulk/", rows, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["errors"], [])
+        node = NetworkObject.objects.get(name="Новое ИП")
+        self.assertEqual(node.level, 2)
+        self.assertEqual(node.path, f"{retail.pk}/{entrepreneur.pk}/")
+        self.assertEqual(node.root_factory_id, retail.pk)
+
+    def test_export_network_objects_csv(self):
+        """Тестирование потоковой выгрузки звеньев сети в CSV."""
+        factory = self.create_network_object(name="Завод")
+        self.create_network_object(name="Сеть", supplier=factory)
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f"{NETWORK_OBJECTS_URL}export/", {"file_format": "csv"}
+            )
+            content = b"".join(response.streaming_content).decode()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = content.strip().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("supplier_name", lines[0])
+        self.assertIn(",Завод,", lines[2])
+
+    def test_export_products_command(self):
+        """Тестирование выгрузки продуктов командой export_network."""
+        factory = self.create_network_object(name="Завод")
+        Product.objects.create(
+            name="Телефон",
+            model="X1",
+            release_date="2024-01-01",
+            network_object=factory,
+        )
+        output = StringIO()
+        call_command(
+            "export_network", dataset="products", file_format="ndjson",
+            stdout=output,
+        )
+        row = json.loads(output.getvalue())
+        self.assertEqual(row["model"], "X1")
+        self.assertEqual(row["network_object_name"], "Завод")
+
+    def test_clear_debt_api(self):
+        """Тестирование очистки задолженности через API по фильтрам."""
+        self.user.is_staff = True
+        self.user.save()
+        self.create_network_object(city="Москва", debt_to_supplier="100.00")
+        self.create_network_object(city="Москва", debt_to_supplier="50.50")
+        self.create_network_object(city="Тверь", debt_to_supplier="10.00")
+        response = self.client.post(
+            f"{NETWORK_OBJECTS_URL}clear_debt/", {"city": "Москва"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["objects_count"], 2)
+        self.assertEqual(response.data["total_amount"], "150.50")
+        self.assertEqual(
+            NetworkObject.objects.filter(debt_to_supplier__gt=0).count(), 1
+        )
+        clearance = DebtClearance.objects.get()
+        self.assertEqual(clearance.cleared_by, self.user)
+        self.assertEqual(clearance.filters["city"], "Москва")
+        self.assertEqual(len(clearance.filters["cleared_ids"]), 2)
+
+    def test_clear_debt_api_requires_filters_and_staff(self):
+        """Тестирование ограничений очистки задолженности через API."""
+        url = f"{NETWORK_OBJECTS_URL}clear_debt/"
+        response = self.client.post(url, {"city": "Москва"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_supplier_tree(self):
+        """Тестирование получения дерева подчинённых звена."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(name="Сеть", supplier=factory)
+        self.create_network_object(name="ИП", supplier=retail)
+        self.create_network_object(name="Другая сеть", supplier=factory)
+        Product.objects.create(
+            name="Телефон",
+            model="X1",
+            release_date="2024-01-01",
+            network_object=retail,
+        )
+        url = reverse(
+            "network:network_objects-tree", kwargs={"pk": factory.pk}
+        )
+        with self.assertNumQueries(3):
+            response = self.client.get(url, {"products": "1"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        subordinates = response.data["subordinates"]
+        self.assertEqual(
+            [node["name"] for node in subordinates], ["Сеть", "Другая сеть"]
+        )
+        self.assertEqual(subordinates[0]["subordinates"][0]["name"], "ИП")
+        self.assertEqual(subordinates[0]["products"][0]["model"], "X1")
+        response = self.client.get(url, {"depth": "1"})
+        self.assertEqual(response.data["subordinates"][0]["subordinates"], [])
+
+    @override_settings(NETWORK_CACHE_ENABLED=True)
+    def test_supplier_tree_not_modified(self):
+        """Тестирование ответа 304 для неизменившегося дерева."""
+        factory = self.create_network_object(name="Завод")
+        url = reverse(
+            "network:network_objects-tree", kwargs={"pk": factory.pk}
+        )
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.create_network_object(name="Сеть", supplier=factory)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        factory.name = "Завод 2"
+        factory.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Завод 2")
+
+    @override_settings(NETWORK_CACHE_ENABLED=False)
+    def test_response_cache_disabled(self):
+        """
+        Тестирование работы без кеша ответов: запись через другой процесс
+        не меняет версию кеша, ETag дерева зависит от содержимого.
+        """
+        factory = self.create_network_object(name="Завод")
+        self.client.get(NETWORK_OBJECTS_URL)
+        response = self.client.get(NETWORK_OBJECTS_URL)
+        self.assertNotIn("X-Cache", response)
+        url = reverse(
+            "network:network_objects-tree", kwargs={"pk": factory.pk}
+        )
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        NetworkObject.objects.filter(pk=factory.pk).update(name="Завод 2")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Завод 2")
+        url = reverse(
+            "network:async_network_objects-tree", kwargs={"pk": factory.pk}
+        )
+        etag = self.async_get(url)["ETag"]
+        response = self.async_get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def create_debt_network(self):
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(
+            name="Сеть", supplier=factory, debt_to_supplier="100.00"
+        )
+        self.create_network_object(
+            name="ИП", supplier=retail, debt_to_supplier="30.00"
+        )
+        self.create_network_object(
+            name="Другое ИП", supplier=factory, debt_to_supplier="5.00"
+        )
+        return factory, retail
+
+    def test_debt_rollups_computed_in_sql(self):
+        """Тестирование расчёта сводной задолженности без сводной таблицы."""
+        factory, retail = self.create_debt_network()
+        response = self.client.get(f"{NETWORK_OBJECTS_URL}debt_rollups/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rollups = {row["network_object"]: row for row in response.data}
+        self.assertEqual(rollups[factory.pk]["direct_debt"], "105.00")
+        self.assertEqual(rollups[factory.pk]["total_debt"], "135.00")
+        self.assertEqual(rollups[retail.pk]["total_debt"], "30.00")
+        response = self.client.get(
+            f"{NETWORK_OBJECTS_URL}debt_rollups/", {"level": "0"}
+        )
+        self.assertEqual(len(response.data), 1)
+
+    @override_settings(NETWORK_DEBT_ROLLUPS_ENABLED=True)
+    def test_debt_rollups_summary_table_is_maintained(self):
+        """Тестирование поддержания сводной таблицы задолженности."""
+        factory, retail = self.create_debt_network()
+        self.assertEqual(
+            DebtRollup.objects.get(pk=factory.pk).total_debt,
+            Decimal("135.00"),
+        )
+        retail.supplier = None
+        retail.save()
+        self.assertEqual(
+            DebtRollup.objects.get(pk=factory.pk).total_debt,
+            Decimal("5.00"),
+        )
+        self.assertEqual(
+            DebtRollup.objects.get(pk=retail.pk).total_debt,
+            Decimal("30.00"),
+        )
+        clear_debt(NetworkObject.objects.filter(name="ИП"))
+        self.assertEqual(
+            DebtRollup.objects.get(pk=retail.pk).total_debt,
+            Decimal("0.00"),
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(f"{NETWORK_OBJECTS_URL}debt_rollups/")
+        self.assertEqual(response.data[0]["total_debt"], "5.00")
+
+    @override_settings(NETWORK_DEBT_ROLLUPS_ENABLED=True)
+    def test_debt_rollups_command_rebuild(self):
+        """Тестирование перестроения сводной таблицы командой."""
+        factory, _ = self.create_debt_network()
+        DebtRollup.objects.all().delete()
+        call_command("debt_rollups", rebuild=True, stdout=StringIO())
+        self.assertEqual(DebtRollup.objects.count(), 2)
+        output = StringIO()
+        call_command("debt_rollups", factories=True, stdout=output)
+        row = json.loads(output.getvalue())
+        self.assertEqual(row["network_object"], factory.pk)
+        self.assertEqual(row["total_debt"], "135.00")
+
+    @override_settings(NETWORK_CACHE_ENABLED=True)
+    def test_list_response_cache(self):
+        """Тестирование кеширования списка и сброса кеша при изменении."""
+        factory = self.create_network_object(name="Завод")
+        response = self.client.get(NETWORK_OBJECTS_URL)
+        self.assertEqual(response["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            response = self.client.get(NETWORK_OBJECTS_URL)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.create_network_object(name="Сеть", supplier=factory)
+        response = self.client.get(NETWORK_OBJECTS_URL)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    @override_settings(NETWORK_CACHE_ENABLED=True)
+    def test_retrieve_cache_invalidated_by_bulk_operations(self):
+        """Тестирование сброса кеша после очистки задолженности."""
+        network_object = self.create_network_object(debt_to_supplier="10.00")
+        url = reverse(
+            "network:network_objects-detail", kwargs={"pk": network_object.pk}
+        )
+        self.client.get(url)
+        clear_debt(NetworkObject.objects.all())
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["debt_to_supplier"], "0.00")
+
+    @override_settings(NETWORK_CACHE_ENABLED=True)
+    def test_cache_stats(self):
+        """Тестирование счётчиков попаданий и промахов кеша."""
+        self.user.is_staff = True
+        self.user.save()
+        self.client.get(NETWORK_OBJECTS_URL)
+        self.client.get(NETWORK_OBJECTS_URL)
+        response = self.client.get(f"{NETWORK_OBJECTS_URL}cache_stats/")
+        self.assertEqual(response.data["hits"], 1)
+        self.assertEqual(response.data["misses"], 1)
+
+    def async_get(self, url, data=None, **extra):
+        """GET-запрос к асинхронному представлению с JWT-токеном."""
+        token = RefreshToken.for_user(self.user).access_token
+        return self.client.get(
+            url, data, HTTP_AUTHORIZATION=f"Bearer {token}", **extra
+        )
+
+    def test_async_list_network_objects(self):
+        """Тестирование асинхронного списка с фильтром и курсором."""
+        for number in range(3):
+            self.create_network_object(name=f"Объект {number}")
+        self.create_network_object(name="Минск", country="Беларусь")
+        url = reverse("network:async_network_objects-list")
+        response = self.async_get(
+            url, {"country": "Россия", "page_size": 2, "fields": "id,name"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(
+            [row["name"] for row in data["results"]],
+            ["Объект 2", "Объект 1"],
+        )
+        self.assertEqual(set(data["results"][0]), {"id", "name"})
+        data = self.async_get(data["next"]).json()
+        self.assertEqual(
+            [row["name"] for row in data["results"]], ["Объект 0"]
+        )
+        self.assertIsNone(data["next"])
+
+    def test_async_list_ordering(self):
+        """
+        Тестирование одинаковой сортировки синхронного и асинхронного
+        списка.
+        """
+        for name in ("Б", "В", "А", "Б"):
+            self.create_network_object(name=name)
+        params = {"fields": "id,name", "ordering": "name"}
+        expected = [
+            (row["name"], row["id"])
+            for row in self.client.get(NETWORK_OBJECTS_URL, params).data[
+                "results"
+            ]
+        ]
+        url = reverse("network:async_network_objects-list")
+        rows = self.async_get(url, params).json()["results"]
+        self.assertEqual([(row["name"], row["id"]) for row in rows], expected)
+        self.assertEqual([name for name, _ in expected], ["А", "Б", "Б", "В"])
+
+    def test_async_retrieve_and_tree(self):
+        """Тестирование асинхронного звена и дерева подчинённых."""
+        factory = self.create_network_object(name="Завод")
+        self.create_network_object(name="Сеть", supplier=factory)
+        url = reverse(
+            "network:async_network_objects-detail", kwargs={"pk": factory.pk}
+        )
+        response = self.async_get(url)
+        self.assertEqual(response.json()["name"], "Завод")
+        url = reverse(
+            "network:async_network_objects-tree", kwargs={"pk": factory.pk}
+        )
+        response = self.async_get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()["subordinates"][0]["name"], "Сеть"
+        )
+        response = self.async_get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        url = reverse(
+            "network:async_network_objects-detail", kwargs={"pk": 0}
+        )
+        self.assertEqual(
+            self.async_get(url).status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_async_views_require_authentication(self):
+        """Тестирование отказа асинхронного списка без токена."""
+        self.client.force_authenticate(user=None)
+        response = self.client.get(
+            reverse("network:async_network_objects-list")
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def create_product_line(self, network_object, count):
+        catalog_products = CatalogProduct.objects.bulk_create(
+            CatalogProduct(
+                name="Телефон", model=f"X{number}", release_date="2024-01-01"
+            )
+            for number in range(count)
+        )
+        return Product.objects.bulk_create(
+            Product(
+                catalog_product=catalog_product,
+                network_object=network_object,
+            )
+            for catalog_product in catalog_products
+        )
+
+    def test_propagate_products_to_all_subordinates(self):
+        """Тестирование передачи продуктов всему дереву подчинённых."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(name="Сеть", supplier=factory)
+        shop = self.create_network_object(name="ИП", supplier=retail)
+        self.create_product_line(factory, 5)
+        Product.objects.create(
+            name="Телефон",
+            model="X0",
+            release_date="2024-01-01",
+            network_object=retail,
+        )
+        url = reverse(
+            "network:network_objects-propagate-products",
+            kwargs={"pk": factory.pk},
+        )
+        with self.assertNumQueries(7):
+            response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {"targets": 2, "created": 9, "skipped": 1}
+        )
+        self.assertEqual(retail.products.count(), 5)
+        self.assertEqual(shop.products.count(), 5)
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.data["created"], 0)
+
+    def test_propagate_selected_products_to_selected_subordinates(self):
+        """Тестирование передачи выбранных продуктов выбранным звеньям."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(name="Сеть", supplier=factory)
+        shop = self.create_network_object(name="ИП", supplier=retail)
+        other = self.create_network_object(
+            name="Другая сеть", supplier=factory
+        )
+        products = self.create_product_line(factory, 3)
+        url = reverse(
+            "network:network_objects-propagate-products",
+            kwargs={"pk": factory.pk},
+        )
+        response = self.client.post(
+            url,
+            {"products": [products[0].pk], "subordinates": [shop.pk]},
+            format="json",
+        )
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(retail.products.get().model, "X0")
+        self.assertEqual(shop.products.get().model, "X0")
+        self.assertFalse(other.products.exists())
+        response = self.client.post(
+            url, {"subordinates": [factory.pk]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("subordinates", response.data)
+
+    def test_products_share_catalog_rows(self):
+        """Тестирование хранения модели продукта в каталоге один раз."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(name="Сеть", supplier=factory)
+        for network_object in (factory, retail):
+            Product.objects.create(
+                name="Телефон",
+                model="X1",
+                release_date="2024-01-01",
+                network_object=network_object,
+            )
+        self.assertEqual(CatalogProduct.objects.count(), 1)
+        self.assertEqual(
+            list(factory.assortment.values_list("model", flat=True)), ["X1"]
+        )
+        product = retail.products.get()
+        self.assertEqual(product.name, "Телефон")
+        product.model = "X2"
+        product.save()
+        self.assertEqual(CatalogProduct.objects.count(), 2)
+        self.assertEqual(factory.products.get().model, "X1")
+
+    def test_list_products_with_filters(self):
+        """Тестирование списка продуктов с фильтрами и курсором."""
+        factory = self.create_network_object(name="Завод")
+        for number, release_date in enumerate(
+            ["2023-05-01", "2024-01-01", "2024-06-01"]
+        ):
+            Product.objects.create(
+                name="Телефон",
+                model=f"X{number}",
+                release_date=release_date,
+                network_object=factory,
+            )
+        url = reverse("network:products-list")
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                url,
+                {
+                    "name": "Тел",
+                    "release_date_after": "2024-01-01",
+                    "page_size": 1,
+                },
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["model"], "X2")
+        self.assertEqual(
+            response.data["results"][0]["network_object_name"], "Завод"
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"][0]["model"], "X1")
+        self.assertIsNone(response.data["next"])
+
+    def test_list_products_query_count_does_not_grow(self):
+        """Тестирование отсутствия N+1 запросов в списке продуктов."""
+        factory = self.create_network_object(name="Завод")
+        self.create_product_line(factory, 2)
+        url = reverse("network:products-list")
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        for number in range(3):
+            network_object = self.create_network_object(
+                name=f"Завод {number}"
+            )
+            self.create_product_line(network_object, 0)
+            Product.objects.create(
+                name="Телефон",
+                model=f"Y{number}",
+                release_date="2024-01-01",
+                network_object=network_object,
+            )
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_network_object_products_nested_route(self):
+        """Тестирование продуктов звена во вложенном маршруте."""
+        factory = self.create_network_object(name="Завод")
+        retail = self.create_network_object(name="Сеть", supplier=factory)
+        self.create_product_line(factory, 2)
+        url = reverse(
+            "network:network_object-products-list",
+            kwargs={"network_object_pk": retail.pk},
+        )
+        product = {
+            "name": "Телефон",
+            "model": "X1",
+            "release_date": "2024-01-01",
+        }
+        response = self.client.post(url, product, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["network_object"], retail.pk)
+        response = self.client.post(url, product, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            url, dict(product, model="Z"), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(url)
+        self.assertEqual(
+            [row["model"] for row in response.data["results"]], ["X1"]
+        )
+        self.assertEqual(CatalogProduct.objects.count(), 2)
+
+    def test_network_object_products_missing_parent(self):
+        """Тестирование вложенного маршрута с несуществующим звеном."""
+        url = reverse(
+            "network:network_object-products-list",
+            kwargs={"network_object_pk": 99999},
+        )
+        self.assertEqual(
+            self.client.get(url).status_code, status.HTTP_404_NOT_FOUND
+        )
+        response = self.client.post(
+            url,
+            {"name": "Телефон", "model": "X1", "release_date": "2024-01-01"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(
+            "/network/api/network_objects/abc/products/"
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_search_network_objects(self):
+        """Тестирование поиска звеньев сети по названию и городу."""
+        factory = self.create_network_object(name="Завод Восток")
+        self.create_network_object(name="Сеть Запад", supplier=factory)
+        self.create_network_object(name="ИП", city="Восточный")
+        response = self.client.get(NETWORK_OBJECTS_URL, {"search": "Вост"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(row["name"] for row in response.data["results"]),
+            ["Завод Восток", "ИП"],
+        )
+        self.assertNotIn("search_vector", response.data["results"][0])
+        response = self.client.get(
+            NETWORK_OBJECTS_URL, {"search": "Вост", "page_size": 1}
+        )
+        self.assertEqual(len(response.data["results"]), 1)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+
+    def test_search_products(self):
+        """Тестирование поиска продуктов по каталогу."""
+        factory = self.create_network_object(name="Завод")
+        for model in ("X1", "X2", "Y1"):
+            Product.objects.create(
+                name="Телефон",
+                model=model,
+                release_date="2024-01-01",
+                network_object=factory,
+            )
+        url = reverse("network:products-list")
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"search": "x"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(row["model"] for row in response.data["results"]),
+            ["X1", "X2"],
+        )
+
+    def test_seed_network_command(self):
+        """Тестирование генерации тестовой сети."""
+        call_command(
+            "seed_network",
+            factories=2,
+            fan_out=3,
+            products=2,
+            stdout=StringIO(),
+        )
+        self.assertEqual(NetworkObject.objects.count(), 2 * (1 + 3 + 9))
+        self.assertEqual(
+            NetworkObject.objects.filter(level=2).count(), 18
+        )
+        entrepreneur = NetworkObject.objects.filter(level=2).first()
+        self.assertEqual(
+            entrepreneur.ancestor_ids,
+            [entrepreneur.root_factory_id, entrepreneur.supplier_id],
+        )
+        self.assertEqual(CatalogProduct.objects.count(), 2)
+        self.assertEqual(Product.objects.count(), 26 * 2)
+        self.assertFalse(check_supplier_chains([entrepreneur]))
+
+    @override_settings(NETWORK_CACHE_ENABLED=True)
+    def test_benchmark_network_command(self):
+        """Тестирование отчёта бенчмарка и отката его изменений."""
+        call_command(
+            "seed_network",
+            factories=2,
+            fan_out=2,
+            products=1,
+            stdout=StringIO(),
+        )
+        objects_count = NetworkObject.objects.count()
+        output = StringIO()
+        call_command(
+            "benchmark_network",
+            iterations=2,
+            warmup=0,
+            bulk_size=5,
+            stdout=output,
+        )
+        report = json.loads(output.getvalue())
+        self.assertEqual(report["network_objects"], objects_count)
+        self.assertEqual(report["scenarios"]["api_list_cached"]["queries"], 0)
+        for result in report["scenarios"].values():
+            self.assertLessEqual(result["p50_ms"], result["max_ms"])
+            self.assertGreater(result["peak_memory_kb"], 0)
+        self.assertEqual(NetworkObject.objects.count(), objects_count)
+        self.assertFalse(User.objects.filter(username="benchmark").exists())
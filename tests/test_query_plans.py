@@ -0,0 +1,39 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from network.query_plans import (HOT_QUERIES, analyze_tables,
+                                 find_missing_indexes, hot_query_plans)
+from network.seeding import seed_network
+
+from .base_test_case import BaseTestCase
+
+
+class QueryPlanTests(BaseTestCase):
+    """Тесты планов горячих запросов на заполненной сети."""
+
+    def setUp(self):
+        super().setUp()
+        seed_network(20, 10, 3)
+        analyze_tables()
+
+    def test_hot_queries_use_indexes(self):
+        """Тестирование ожидаемых индексов в планах горячих запросов."""
+        plans = hot_query_plans()
+        self.assertEqual(set(plans), set(HOT_QUERIES))
+        problems = find_missing_indexes()
+        self.assertEqual(
+            problems,
+            {},
+            "\n".join(plan for _, plan in problems.values()),
+        )
+
+    def test_check_query_plans_command(self):
+        """Тестирование команды check_query_plans на тестовой сети."""
+        output = StringIO()
+        call_command(
+            "check_query_plans", factories=2, fan_out=2, stdout=output
+        )
+        self.assertIn(
+            "Все запросы используют ожидаемые индексы.", output.getvalue()
+        )
@@ -0,0 +1,121 @@
+from contextlib import ExitStack
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from config.db_router import pin_to_primary, read_from_replica
+from network.models import NetworkObject
+
+from .base_test_case import BaseTransactionTestCase
+
+NETWORK_OBJECTS_URL = reverse("network:network_objects-list")
+REPLICAS = settings.DATABASE_REPLICAS
+
+
+class ReplicaQueries(ExitStack):
+    """Запросы ко всем репликам внутри блока."""
+
+    def __enter__(self):
+        super().__enter__()
+        self.contexts = [
+            self.enter_context(CaptureQueriesContext(connections[alias]))
+            for alias in REPLICAS
+        ]
+        return self
+
+    def __len__(self):
+        return sum(len(context) for context in self.contexts)
+
+
+@skipUnless(REPLICAS, "реплики не настроены (DB_REPLICA_HOSTS)")
+class ReplicaRoutingTests(BaseTransactionTestCase):
+    """Тесты чтения звеньев сети из реплики."""
+
+    databases = {"default", *REPLICAS}
+
+    def test_safe_requests_read_from_replica(self):
+        """Тестирование списка и звена из реплики."""
+        factory = self.create_network_object(name="Завод")
+        with ReplicaQueries() as replica:
+            response = self.client.get(NETWORK_OBJECTS_URL)
+            self.client.get(
+                reverse("network:network_objects-detail", args=[factory.pk])
+            )
+        self.assertEqual(response.data["results"][0]["name"], "Завод")
+        self.assertEqual(len(replica), 2)
+
+    def test_reads_after_write_stay_on_primary(self):
+        """Тестирование чтения своих изменений после записи."""
+        factory = self.create_network_object(name="Завод")
+        response = self.client.post(
+            NETWORK_OBJECTS_URL,
+            {
+                "name": "Сеть",
+                "email": "r@r.ru",
+                "country": "Россия",
+                "city": "Москва",
+                "street": "Тверская",
+                "house_number": "1",
+                "supplier": factory.pk,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with ReplicaQueries() as replica:
+            response = self.client.get(NETWORK_OBJECTS_URL)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(len(replica), 0)
+
+    @override_settings(NETWORK_CACHE_ENABLED=True)
+    def test_replica_responses_not_cached(self):
+        """Тестирование кеша ответов при чтении из реплики."""
+        self.create_network_object(name="Завод")
+        first = self.client.get(NETWORK_OBJECTS_URL)
+        second = self.client.get(NETWORK_OBJECTS_URL)
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "MISS")
+
+    @override_settings(NETWORK_CACHE_ENABLED=True)
+    def test_pinned_user_bypasses_cache(self):
+        """Тестирование чтения мимо кеша после записи."""
+        self.create_network_object(name="Завод")
+        reader = APIClient()
+        reader.force_authenticate(
+            user=self.create_user(username="reader", email="r@e.ru")
+        )
+        pin_to_primary(self.user)
+        self.assertEqual(
+            self.client.get(NETWORK_OBJECTS_URL)["X-Cache"], "MISS"
+        )
+        self.assertEqual(
+            self.client.get(NETWORK_OBJECTS_URL)["X-Cache"], "MISS"
+        )
+        self.assertEqual(reader.get(NETWORK_OBJECTS_URL)["X-Cache"], "HIT")
+
+    def test_export_streams_from_replica(self):
+        """Тестирование потоковой выгрузки из реплики."""
+        self.create_network_object(name="Завод")
+        response = self.client.get(
+            reverse("network:network_objects-export"),
+            {"file_format": "ndjson"},
+        )
+        with ReplicaQueries() as replica:
+            lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertGreater(len(replica), 0)
+
+    def test_save_reads_from_primary(self):
+        """Тестирование чтений в транзакции сохранения звена."""
+        factory = self.create_network_object(name="Завод")
+        with read_from_replica(), ReplicaQueries() as replica:
+            factory = NetworkObject.objects.get(pk=factory.pk)
+            factory.name = "Завод 2"
+            factory.save()
+        self.assertEqual(factory._state.db, "default")
+        self.assertEqual(len(replica), 1)
@@ -1,10 +1,31 @@
+from datetime import timedelta
+from smtplib import SMTPServerDisconnected
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
 
-from users.models import User
+from config.checks import check_shared_cache
+from users.authentication import StatelessJWTAuthentication
+from users.models import OutgoingEmail, User
+from users.outbox import send_pending_emails
+from users.revocation import revoked_users
 
 from .base_test_case import BaseTestCase
 
 
+class FailingEmailBackend(EmailBackend):
+    """Почтовый бэкенд, имитирующий недоступный SMTP-сервер."""
+
+    def send_messages(self, messages):
+        raise SMTPServerDisconnected("Соединение разорвано.")
+
+
 class TestUser(BaseTestCase):
 
     def test_create_user(self):
@@ -31,3 +52,184 @@ class TestUser(BaseTestCase):
         response = self.client.post("/users/", data=data)
         assert response.status_code == 400
         assert "email" in response.data
+
+    def obtain_access_token(self):
+        """Получение access-токена через эндпоинт выдачи токенов."""
+        self.user.set_password("test")
+        self.user.save()
+        self.client.force_authenticate(user=None)
+        response = self.client.post(
+            "/users/token/",
+            data={"email": self.user.email, "password": "test"},
+        )
+        assert response.status_code == 200
+        return response.data["access"]
+
+    def authenticate(self, token):
+        request = APIRequestFactory().get(
+            "/network/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+        return StatelessJWTAuthentication().authenticate(request)
+
+    def test_stateless_authentication_without_queries(self):
+        """Аутентификация по токену не обращается к таблице пользователей."""
+        token = self.obtain_access_token()
+        revoked_users.reload()
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(token)
+        assert int(user.id) == self.user.id
+        assert user.is_active
+        assert not user.is_staff
+
+    def test_stateless_authentication_rejects_inactive_user(self):
+        """Токен деактивированного пользователя отклоняется."""
+        token = self.obtain_access_token()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_stateless_authentication_rejects_deleted_user(self):
+        """Токен удалённого пользователя отклоняется."""
+        token = self.obtain_access_token()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+    def test_stateless_authentication_rejects_demoted_staff(self):
+        """Токен с is_staff после снятия статуса сотрудника отклоняется."""
+        self.user.is_staff = True
+        self.user.save()
+        token = self.obtain_access_token()
+        self.user.is_staff = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+        self.user.is_staff = True
+        self.user.save()
+        user, _ = self.authenticate(self.obtain_access_token())
+        assert user.is_staff
+
+    def test_token_refresh_reissues_claims(self):
+        """Обновлённый access-токен получает утверждения из БД."""
+        self.user.is_staff = True
+        self.user.set_password("test")
+        self.user.save()
+        self.client.force_authenticate(user=None)
+        refresh = self.client.post(
+            "/users/token/",
+            data={"email": self.user.email, "password": "test"},
+        ).data["refresh"]
+        self.user.is_staff = False
+        self.user.save()
+        response = self.client.post(
+            "/users/token/refresh/", data={"refresh": refresh}
+        )
+        assert response.status_code == 200
+        user, _ = self.authenticate(response.data["access"])
+        assert not user.is_staff
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(
+            "/users/token/refresh/", data={"refresh": refresh}
+        )
+        assert response.status_code == 401
+
+    def test_stateless_authentication_requires_shared_cache(self):
+        """JWT_STATELESS_AUTH не допускается с кешем одного процесса."""
+        with override_settings(DATABASE_REPLICAS=[]):
+            with override_settings(JWT_STATELESS_AUTH=True):
+                errors = check_shared_cache(None)
+            assert [error.id for error in errors] == ["config.E001"]
+            assert check_shared_cache(None) == []
+
+    def test_replicas_require_shared_cache(self):
+        """Реплики для чтения не допускаются с кешем одного процесса."""
+        with override_settings(DATABASE_REPLICAS=["replica"]):
+            errors = check_shared_cache(None)
+        assert [error.id for error in errors] == ["config.E002"]
+        redis = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://redis:6379/0",
+            }
+        }
+        with override_settings(DATABASE_REPLICAS=["replica"], CACHES=redis):
+            assert check_shared_cache(None) == []
+
+    def test_reset_password_enqueues_email(self):
+        """Запрос сброса пароля ставит письмо в очередь, не отправляя его."""
+        response = self.client.post(
+            "/users/reset_password/", data={"email": self.user.email}
+        )
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0
+        email = OutgoingEmail.objects.get()
+        assert email.recipients == [self.user.email]
+        assert email.status == OutgoingEmail.Status.PENDING
+
+    def test_reset_password_unknown_email(self):
+        """Для неизвестного адреса письмо не ставится в очередь."""
+        response = self.client.post(
+            "/users/reset_password/", data={"email": "unknown@example.com"}
+        )
+        assert response.status_code == 200
+        assert not OutgoingEmail.objects.exists()
+
+    def test_send_outbox(self):
+        """Обработчик очереди отправляет письма порциями."""
+        for _ in range(3):
+            self.client.post(
+                "/users/reset_password/", data={"email": self.user.email}
+            )
+        call_command("send_outbox", "--once", "--batch-size", "2")
+        assert len(mail.outbox) == 3
+        assert "/reset-password/" in mail.outbox[0].body
+        assert not OutgoingEmail.objects.exclude(
+            status=OutgoingEmail.Status.SENT
+        ).exists()
+        assert not OutgoingEmail.objects.exclude(body="").exists()
+
+    @override_settings(
+        EMAIL_BACKEND="tests.test_user.FailingEmailBackend",
+        EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+    )
+    def test_send_outbox_retries(self):
+        """Неудачная отправка повторяется, затем письмо помечается."""
+        email = OutgoingEmail.objects.create(
+            subject="Тема", body="Текст", recipients=[self.user.email]
+        )
+        assert send_pending_emails() == (0, 1)
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.Status.PENDING
+        assert email.body == "Текст"
+        assert email.attempts == 1
+        assert "SMTPServerDisconnected" in email.last_error
+        assert send_pending_emails() == (0, 0)
+        OutgoingEmail.objects.update(send_after=email.created_at)
+        assert send_pending_emails() == (0, 1)
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.Status.FAILED
+        assert email.body == ""
+
+    def test_send_outbox_lease(self):
+        """
+        Отправляемое письмо не берётся повторно до истечения аренды,
+        после неё возвращается в очередь.
+        """
+        email = OutgoingEmail.objects.create(
+            subject="Тема",
+            body="Текст",
+            recipients=[self.user.email],
+            status=OutgoingEmail.Status.SENDING,
+            leased_until=timezone.now() + timedelta(minutes=1),
+            attempts=1,
+        )
+        assert send_pending_emails() == (0, 0)
+        OutgoingEmail.objects.update(leased_until=timezone.now())
+        assert send_pending_emails() == (1, 0)
+        email.refresh_from_db()
+        assert email.status == OutgoingEmail.Status.SENT
+        assert email.attempts == 2
+        assert email.leased_until is None
+        assert len(mail.outbox) == 1
@@ -1,8 +1,29 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_filter = ("is_active",)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    # Текст письма может содержать ссылку сброса пароля с токеном.
+    exclude = ("body",)
+    readonly_fields = (
+        "subject",
+        "from_email",
+        "recipients",
+        "attempts",
+        "last_error",
+        "leased_until",
+        "created_at",
+        "sent_at",
+    )
+
+    def has_add_permission(self, request):
+        return False
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UsersConfig(AppConfig):
@@ -7,4 +8,9 @@ class UsersConfig(AppConfig):
     verbose_name = "Пользователи"
 
     def ready(self):
+        import config.checks  # noqa: F401
         import users.signals  # noqa: F401
+        from config.metrics import connect_query_wrapper
+
+        if settings.METRICS_ENABLED:
+            connect_query_wrapper()
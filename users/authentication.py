@@ -0,0 +1,37 @@
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication, JWTStatelessUserAuthentication)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .revocation import revoked_users
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Аутентифицирует по утверждениям токена (id, username, email,
+    is_active, is_staff) без запроса к таблице пользователей.
+
+    Деактивированные пользователи отклоняются по множеству отозванных
+    пользователей, токены с is_staff пользователей, лишённых статуса
+    сотрудника, — по списку понижений. Токены, выданные до появления
+    утверждения is_active, проверяются по БД.
+    """
+
+    def get_user(self, validated_token):
+        if "is_active" not in validated_token:
+            return JWTAuthentication.get_user(self, validated_token)
+        user = super().get_user(validated_token)
+        if (
+            not validated_token["is_active"]
+            or validated_token[api_settings.USER_ID_CLAIM] in revoked_users
+        ):
+            raise AuthenticationFailed(
+                "Пользователь неактивен.", code="user_inactive"
+            )
+        if validated_token.get("is_staff") and revoked_users.is_demoted(
+            validated_token[api_settings.USER_ID_CLAIM]
+        ):
+            raise AuthenticationFailed(
+                "Статус сотрудника отозван.", code="user_demoted"
+            )
+        return user
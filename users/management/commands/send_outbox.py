@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management import BaseCommand
+
+from users.outbox import send_pending_emails
+
+
+class Command(BaseCommand):
+    """
+    Отправляет письма из очереди порциями через одно SMTP-соединение,
+    которое держится открытым, пока в очереди есть письма.
+    """
+
+    help = "Обработчик очереди исходящих писем."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Обработать очередь один раз и завершиться.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="Количество писем в одной порции.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+            help="Пауза между опросами пустой очереди, секунд.",
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        try:
+            while True:
+                sent, failed = send_pending_emails(
+                    connection, options["batch_size"]
+                )
+                if sent or failed:
+                    self.stdout.write(
+                        f"Отправлено: {sent}, с ошибкой: {failed}."
+                    )
+                    continue
+                if options["once"]:
+                    break
+                connection.close()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
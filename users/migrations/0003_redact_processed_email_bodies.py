@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def redact_processed_bodies(apps, schema_editor):
+    OutgoingEmail = apps.get_model("users", "OutgoingEmail")
+    OutgoingEmail.objects.exclude(status="pending").update(body="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_outgoingemail"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            redact_processed_bodies, migrations.RunPython.noop
+        ),
+    ]
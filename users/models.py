@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser, PermissionsMixin
 from django.db import models
+from django.utils import timezone
 
 
 class User(AbstractUser, PermissionsMixin):
@@ -20,3 +21,57 @@ class User(AbstractUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Ожидает отправки"
+        SENDING = "sending", "Отправляется"
+        SENT = "sent", "Отправлено"
+        FAILED = "failed", "Не отправлено"
+
+    subject = models.CharField(max_length=255, verbose_name="Тема")
+    body = models.TextField(verbose_name="Текст")
+    from_email = models.CharField(
+        max_length=255, blank=True, verbose_name="Отправитель"
+    )
+    recipients = models.JSONField(default=list, verbose_name="Получатели")
+    status = models.CharField(
+        max_length=10,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name="Статус",
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name="Попыток отправки"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    send_after = models.DateTimeField(
+        default=timezone.now, verbose_name="Отправить после"
+    )
+    leased_until = models.DateTimeField(
+        null=True, blank=True, verbose_name="Отправляется до"
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Дата создания"
+    )
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Дата отправки"
+    )
+
+    class Meta:
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        ordering = ("-created_at",)
+        indexes = [
+            models.Index(
+                fields=["send_after", "id"],
+                condition=models.Q(status="pending"),
+                name="users_outbox_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.recipients)}"
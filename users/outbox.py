@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def enqueue_email(subject, body, recipients, from_email=None):
+    """Ставит письмо в очередь на отправку без обращения к SMTP."""
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or "",
+        recipients=list(recipients),
+    )
+
+
+def _retry_delay(attempts):
+    """Задержка перед повторной попыткой растёт вдвое с каждой неудачей."""
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def _claim_emails(batch_size):
+    """
+    Забирает порцию писем в короткой транзакции: помечает их
+    отправляемыми до истечения аренды EMAIL_OUTBOX_LEASE и сразу
+    засчитывает попытку. Строки блокируются с SKIP LOCKED (там, где это
+    поддерживается), поэтому несколько обработчиков не заберут одно
+    письмо. Письма, аренда которых истекла (обработчик упал во время
+    отправки), возвращаются в очередь.
+    """
+    now = timezone.now()
+    OutgoingEmail.objects.filter(
+        status=OutgoingEmail.Status.SENDING, leased_until__lte=now
+    ).update(status=OutgoingEmail.Status.PENDING, leased_until=None)
+    leased_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutgoingEmail.Status.PENDING, send_after__lte=now)
+            .order_by("send_after", "id")[:batch_size]
+        )
+        for email in emails:
+            email.status = OutgoingEmail.Status.SENDING
+            email.leased_until = leased_until
+            email.attempts += 1
+        OutgoingEmail.objects.bulk_update(
+            emails, ["status", "leased_until", "attempts"]
+        )
+    return emails
+
+
+def _record_result(email):
+    """
+    Сохраняет результат отправки письма, если аренда ещё принадлежит
+    этому обработчику.
+    """
+    OutgoingEmail.objects.filter(
+        pk=email.pk,
+        status=OutgoingEmail.Status.SENDING,
+        leased_until=email.leased_until,
+    ).update(
+        status=email.status,
+        leased_until=None,
+        last_error=email.last_error,
+        send_after=email.send_after,
+        sent_at=email.sent_at,
+        body=email.body,
+    )
+
+
+def send_pending_emails(connection=None, batch_size=None):
+    """
+    Отправляет порцию писем из очереди через одно SMTP-соединение.
+
+    Порция забирается в короткой транзакции, письма отправляются вне
+    её, результат каждого записывается сразу после отправки: медленный
+    SMTP не держит блокировки и транзакцию.
+    Неудачная отправка переносится с растущей задержкой, после
+    EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо помечается неотправленным.
+    Текст отправленных и неотправленных писем стирается: в нём могут
+    быть ссылки сброса пароля с действующим токеном.
+    Соединение остаётся открытым для следующих порций.
+
+    Возвращает пару (отправлено, с ошибкой).
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    connection = connection or get_connection()
+    sent = failed = 0
+    for email in _claim_emails(batch_size):
+        message = EmailMessage(
+            email.subject,
+            email.body,
+            email.from_email or None,
+            email.recipients,
+            connection=connection,
+        )
+        try:
+            connection.open()
+            message.send()
+        except Exception as error:
+            failed += 1
+            email.last_error = f"{type(error).__name__}: {error}"
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = OutgoingEmail.Status.FAILED
+                email.body = ""
+            else:
+                email.status = OutgoingEmail.Status.PENDING
+                email.send_after = timezone.now() + _retry_delay(
+                    email.attempts
+                )
+            connection.close()
+        else:
+            sent += 1
+            email.status = OutgoingEmail.Status.SENT
+            email.sent_at = timezone.now()
+            email.last_error = ""
+            email.body = ""
+        _record_result(email)
+    return sent, failed
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+DELETED_USERS_KEY = "users:revoked:deleted"
+DEMOTED_USERS_KEY = "users:revoked:demoted"
+
+
+def _token_lifetime():
+    return settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds()
+
+
+class RevokedUsers:
+    """
+    Множество отозванных пользователей, кешируемое в процессе на
+    JWT_REVOCATION_TTL секунд: неактивные пользователи из БД и удалённые
+    пользователи из общего кеша. Отдельно хранятся пользователи,
+    лишённые статуса сотрудника: их токены с is_staff недействительны.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = frozenset()
+        self._demoted = frozenset()
+        self._expires_at = 0.0
+
+    def __contains__(self, user_id):
+        self._refresh()
+        return int(user_id) in self._ids
+
+    def is_demoted(self, user_id):
+        """Проверяет, лишён ли пользователь статуса сотрудника."""
+        self._refresh()
+        return int(user_id) in self._demoted
+
+    def _refresh(self):
+        if time.monotonic() >= self._expires_at:
+            self.reload()
+
+    def reload(self):
+        from .models import User
+
+        with self._lock:
+            ids = set(
+                User.objects.filter(is_active=False).values_list(
+                    "pk", flat=True
+                )
+            )
+            shared = cache.get_many([DELETED_USERS_KEY, DEMOTED_USERS_KEY])
+            ids.update(shared.get(DELETED_USERS_KEY, ()))
+            self._ids = frozenset(ids)
+            self._demoted = frozenset(shared.get(DEMOTED_USERS_KEY, ()))
+            self._expires_at = (
+                time.monotonic() + settings.JWT_REVOCATION_TTL
+            )
+
+    def invalidate(self):
+        """Заставляет перечитать множество при следующей проверке."""
+        self._expires_at = 0.0
+
+    def _update_shared(self, key, user_id, add=True):
+        users = set(cache.get(key, ()))
+        if add:
+            users.add(user_id)
+        else:
+            users.discard(user_id)
+        cache.set(key, users, _token_lifetime())
+        self.invalidate()
+
+    def add_deleted(self, user_id):
+        """Запоминает удалённого пользователя до истечения его токенов."""
+        self._update_shared(DELETED_USERS_KEY, user_id)
+
+    def add_demoted(self, user_id):
+        """
+        Запоминает пользователя, лишённого статуса сотрудника, до
+        истечения его токенов.
+        """
+        self._update_shared(DEMOTED_USERS_KEY, user_id)
+
+    def remove_demoted(self, user_id):
+        """Снимает отметку при возврате статуса сотрудника."""
+        self._update_shared(DEMOTED_USERS_KEY, user_id, add=False)
+
+
+revoked_users = RevokedUsers()
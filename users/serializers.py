@@ -1,6 +1,9 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.serializers import (AuthUser,
-                                                  TokenObtainPairSerializer)
+                                                  TokenObtainPairSerializer,
+                                                  TokenRefreshSerializer)
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import Token
 
 from .models import User
@@ -45,11 +48,42 @@ class ResetPasswordConfirmSerializer(serializers.Serializer):
     new_password = serializers.CharField(min_length=8)
 
 
+def set_user_claims(token: Token, user: AuthUser) -> Token:
+    """Записывает в токен утверждения для StatelessJWTAuthentication."""
+    token["username"] = user.username
+    token["email"] = user.email
+    token["is_active"] = user.is_active
+    token["is_staff"] = user.is_staff
+    return token
+
+
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
 
     @classmethod
     def get_token(cls, user: AuthUser) -> Token:
-        token = super().get_token(user)
-        token["username"] = user.username
-        token["email"] = user.email
-        return token
+        return set_user_claims(super().get_token(user), user)
+
+
+class MyTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Выпускает access-токен с утверждениями из БД, а не из refresh-токена:
+    пользователь, лишённый статуса сотрудника, не получит новый токен
+    с is_staff до истечения refresh-токена.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = User.objects.filter(
+            **{
+                api_settings.USER_ID_FIELD: refresh.payload.get(
+                    api_settings.USER_ID_CLAIM
+                )
+            }
+        ).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"],
+                "no_active_account",
+            )
+        set_user_claims(refresh, user)
+        return {"access": str(refresh.access_token)}
@@ -1,9 +1,46 @@
 from django.core.management import call_command
-from django.db.models.signals import post_migrate
+from django.db.models.signals import (post_delete, post_migrate, post_save,
+                                      pre_save)
 from django.dispatch import receiver
 
+from .models import User
+from .revocation import revoked_users
+
 
 @receiver(post_migrate)
 def create_superuser_on_migrate(sender, **kwargs):
     if sender.label == "users":
         call_command("create_superuser_command")
+
+
+@receiver(pre_save, sender=User)
+def revoke_staff_tokens(sender, instance, update_fields=None, **kwargs):
+    """
+    Отзывает токены с is_staff у пользователя, лишённого статуса
+    сотрудника, и снимает отзыв при возврате статуса.
+    """
+    if instance.pk is None or (
+        update_fields is not None and "is_staff" not in update_fields
+    ):
+        return
+    was_staff = (
+        User.objects.filter(pk=instance.pk)
+        .values_list("is_staff", flat=True)
+        .first()
+    )
+    if was_staff and not instance.is_staff:
+        revoked_users.add_demoted(instance.pk)
+    elif was_staff is False and instance.is_staff:
+        revoked_users.remove_demoted(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def refresh_revoked_users(sender, instance, **kwargs):
+    """Перечитывает множество отозванных пользователей этого процесса."""
+    revoked_users.invalidate()
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender, instance, **kwargs):
+    """Отзывает токены удалённого пользователя."""
+    revoked_users.add_deleted(instance.pk)
@@ -1,11 +1,11 @@
 from django.urls import include, path
 from rest_framework.permissions import AllowAny
 from rest_framework.routers import SimpleRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 
 from .apps import UsersConfig
-from .views import (MyTokenObtainPairView, ResetPasswordAPIViews,
-                    ResetPasswordConfirmAPIView, UserViewSet)
+from .views import (MyTokenObtainPairView, MyTokenRefreshView,
+                    ResetPasswordAPIViews, ResetPasswordConfirmAPIView,
+                    UserViewSet)
 
 app_name = UsersConfig.name
 
@@ -20,7 +20,7 @@ urlpatterns = [
     ),
     path(
         "token/refresh/",
-        TokenRefreshView.as_view(permission_classes=(AllowAny,)),
+        MyTokenRefreshView.as_view(permission_classes=(AllowAny,)),
         name="token_refresh",
     ),
     path(
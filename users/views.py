@@ -1,7 +1,6 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.utils.encoding import force_bytes, force_str
 from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django_filters.rest_framework import DjangoFilterBackend
@@ -11,10 +10,13 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import (TokenObtainPairView,
+                                            TokenRefreshView)
 
 from .models import User
+from .outbox import enqueue_email
 from .serializers import (MyTokenObtainPairSerializer,
+                          MyTokenRefreshSerializer,
                           ResetPasswordConfirmSerializer,
                           ResetPasswordSerializer, UserSerializer)
 
@@ -63,13 +65,7 @@ class ResetPasswordAPIViews(APIView):
                     reset_link = f"/reset_password_confirm/{uid}/{token}"
                 subject = "Reset your password"
                 message = f"Ссылка для сброса пароля: {reset_link}"
-                send_mail(
-                    subject,
-                    message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [email],
-                    fail_silently=True,
-                )
+                enqueue_email(subject, message, [user.email])
             return Response(
                 {
                     "detail": """
@@ -119,3 +115,7 @@ class ResetPasswordConfirmAPIView(APIView):
 
 class MyTokenObtainPairView(TokenObtainPairView):
     serializer_class = MyTokenObtainPairSerializer
+
+
+class MyTokenRefreshView(TokenRefreshView):
+    serializer_class = MyTokenRefreshSerializer